@@ -9,18 +9,374 @@ SEOマスターパッケージ - モバイルフレンドリー分析モジュ
 import logging
 import json
 import os
+import bisect
+import codecs
+import functools
 import re
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
 import urllib.parse
+from html.parser import HTMLParser
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 from src.core.analyzer import SEOAnalyzer
 
 # ロギングの設定
 logger = logging.getLogger(__name__)
 
+# 各チェックが対象とするタグ名
+_BLOCK_TAGS = frozenset(('div', 'table', 'section', 'article'))
+_CLICKABLE_TAGS = frozenset(('a', 'button', 'input', 'select', 'textarea'))
+_TEXT_TAGS = frozenset(('p', 'span', 'div', 'a', 'li', 'td'))
+_STYLE_CHECK_TAGS = _BLOCK_TAGS | _CLICKABLE_TAGS | _TEXT_TAGS
+_COLLECTED_TAGS = _STYLE_CHECK_TAGS | {'img', 'style', 'meta'}
+
+# インラインスタイル解析用の正規表現
+# Python 3.11以降では強欲な量指定子を使い、一致しないスタイルでのバックトラックを避ける
+# _STYLE_VALUES_RE は幅・高さ・フォントサイズの値を一度の走査でまとめて抽出する
+if sys.version_info >= (3, 11):
+    _WIDTH_PX_RE = re.compile(r'width:\s*+(\d++)px')
+    _STYLE_VALUES_RE = re.compile(
+        r'width:\s*+(?P<width>\d++)px|height:\s*+(?P<height>\d++)px'
+        r'|font-size:\s*+(?P<font_size>\d++)(?P<font_unit>px|pt|rem|em)'
+    )
+else:
+    _WIDTH_PX_RE = re.compile(r'width:\s*(\d+)px')
+    _STYLE_VALUES_RE = re.compile(
+        r'width:\s*(?P<width>\d+)px|height:\s*(?P<height>\d+)px'
+        r'|font-size:\s*(?P<font_size>\d+)(?P<font_unit>px|pt|rem|em)'
+    )
+
+# いずれかのチェックに関係する宣言を一度の走査で検出するための正規表現と、
+# 検出結果を表すビットフラグ
+# （幅・高さは先読みで判定し、後続の宣言を読み飛ばさないようにする）
+_INTERESTING_STYLE_RE = re.compile(r'(?P<width>width[:=])(?=[^;]*px)|(?P<height>height:)(?=[^;]*px)|(?P<font>font-size:)')
+_STYLE_WIDTH = 1
+_STYLE_HEIGHT = 2
+_STYLE_FONT_SIZE = 4
+_STYLE_FLAGS = {'width': _STYLE_WIDTH, 'height': _STYLE_HEIGHT, 'font': _STYLE_FONT_SIZE}
+
+# データディレクトリ（インポート時に一度だけ作成）
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+os.makedirs(_DATA_DIR, exist_ok=True)
+
+# ページ取得用HTTPキャッシュの保存先と有効期限（秒）
+_HTTP_CACHE_PATH = os.path.join(_DATA_DIR, 'mobile_http_cache.sqlite')
+_HTTP_CACHE_EXPIRE = 3600
+_session = None
+
+# ページ取得時に使用するモバイルユーザーエージェント
+_MOBILE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
+}
+
+# 複数URLを分析する際の同一ドメインへのリクエスト間隔（秒）
+_DOMAIN_REQUEST_INTERVAL = 0.2
+
+
+def _get_session():
+    """
+    ページ取得に使用するHTTPセッションを返す
+    
+    requests-cacheが利用可能な場合はSQLiteに応答をキャッシュするセッションを使用し、
+    同じURLを再分析する際のネットワーク取得を省略する。
+    
+    Returns:
+        requests_cache.CachedSession or module: getメソッドを持つHTTPクライアント
+    """
+    global _session
+    if _session is None:
+        if requests_cache is not None:
+            _session = requests_cache.CachedSession(
+                _HTTP_CACHE_PATH,
+                expire_after=_HTTP_CACHE_EXPIRE,
+                allowable_codes=(200,),
+                cache_control=True
+            )
+        else:
+            _session = requests
+    return _session
+
+
+class _HeadParsingFinished(Exception):
+    """<head>の解析が終わったことを通知するための例外"""
+
+
+class _ViewportParser(HTMLParser):
+    """<head>内のビューポートメタタグのみを取り出すインクリメンタルパーサー"""
+    
+    def __init__(self):
+        super().__init__()
+        self.viewport_content = None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            raise _HeadParsingFinished()
+        if tag == 'meta' and self.viewport_content is None:
+            attrs = dict(attrs)
+            if attrs.get('name') == 'viewport':
+                self.viewport_content = attrs.get('content') or ''
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            raise _HeadParsingFinished()
+
+
+class _DomainRateLimiter:
+    """同一ドメインへのリクエストに最小間隔を空けるためのレートリミッター"""
+    
+    def __init__(self, interval):
+        """
+        Args:
+            interval (float): 同一ドメインへのリクエスト間隔（秒）
+        """
+        self.interval = interval
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url):
+        """
+        URLのドメインに対して次のリクエストが許可されるまで待機する
+        
+        Args:
+            url (str): リクエスト対象のURL
+        """
+        domain = urllib.parse.urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(domain, now))
+            self._next_allowed[domain] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _LexborElement:
+    """
+    selectolaxのノードをBeautifulSoupのTagと同じ形で扱うための薄いラッパー
+    
+    各チェックが使用する name / get() / string / strings / find_parent() のみを提供する。
+    """
+    
+    __slots__ = ('_node', 'name')
+    
+    def __init__(self, node):
+        self._node = node
+        self.name = node.tag
+    
+    def get(self, key, default=None):
+        attributes = self._node.attributes
+        if key not in attributes:
+            return default
+        value = attributes[key] or ''
+        # BeautifulSoupと同様にclass属性はリストで返す
+        return value.split() if key == 'class' else value
+    
+    @property
+    def string(self):
+        return self._node.text(deep=True) or None
+    
+    @property
+    def strings(self):
+        for node in self._node.traverse(include_text=True):
+            if node.tag == '-text':
+                yield node.text(deep=False)
+    
+    def find_parent(self, name):
+        node = self._node.parent
+        while node is not None:
+            if node.tag == name:
+                return _LexborElement(node)
+            node = node.parent
+        return None
+
+
+def _style_flags(style):
+    """
+    インラインスタイルにどのチェックが関係する宣言が含まれるかを判定する
+    
+    Args:
+        style (str): style属性の値
+        
+    Returns:
+        int: _STYLE_WIDTH / _STYLE_HEIGHT / _STYLE_FONT_SIZE の論理和
+    """
+    flags = 0
+    for match in _INTERESTING_STYLE_RE.finditer(style):
+        flags |= _STYLE_FLAGS[match.lastgroup]
+    return flags
+
+
+def _extract_style_values(styled):
+    """
+    複数要素のインラインスタイルから幅・高さ・フォントサイズの値をまとめて抽出する
+    
+    スタイルを連結した文字列に対して正規表現を一度だけ実行し、一致位置から
+    元の要素に振り分ける。各値は要素ごとに最初に一致したものを使用する。
+    
+    Args:
+        styled (list): (style値, 抽出結果を格納する辞書) のリスト
+    """
+    if not styled:
+        return
+    
+    offsets = []
+    position = 0
+    for style, _ in styled:
+        offsets.append(position)
+        position += len(style) + 1
+    
+    # NUL文字はHTMLの属性値に現れず、正規表現にも一致しないため区切りとして使用する
+    blob = '\0'.join(style for style, _ in styled)
+    for match in _STYLE_VALUES_RE.finditer(blob):
+        values = styled[bisect.bisect_right(offsets, match.start()) - 1][1]
+        if match.group('width') is not None:
+            values.setdefault('width', match.group('width'))
+        elif match.group('height') is not None:
+            values.setdefault('height', match.group('height'))
+        else:
+            values.setdefault('font_size', (match.group('font_size'), match.group('font_unit')))
+
+
+def _peek_text(element, length=30):
+    """
+    要素のテキストを先頭から指定文字数だけ取得する
+    
+    get_text()と異なり、必要な文字数に達した時点で子孫の走査を打ち切る。
+    
+    Args:
+        element (Tag): 対象要素
+        length (int, optional): 取得する最大文字数
+        
+    Returns:
+        str: 要素テキストの先頭部分
+    """
+    parts = []
+    total = 0
+    for text in element.strings:
+        parts.append(text)
+        total += len(text)
+        if total >= length:
+            break
+    return ''.join(parts)[:length]
+
+
+class _ParsedPage:
+    """取得したページの解析結果と、各チェックが使用する要素の収集結果"""
+    
+    def __init__(self, html):
+        """
+        Args:
+            html (str): ページのHTML
+        """
+        self.html = html
+        self.soup = None
+        self.tree = None
+        if LexborHTMLParser is not None:
+            # selectolaxが利用可能な場合はC実装のパーサーを使用
+            self.tree = LexborHTMLParser(html)
+        else:
+            try:
+                self.soup = BeautifulSoup(html, 'lxml')
+            except FeatureNotFound:
+                # lxmlが利用できない環境では標準のパーサーを使用
+                self.soup = BeautifulSoup(html, 'html.parser')
+        self._collect_elements()
+    
+    def _iter_tags(self):
+        """
+        文書内のタグを出現順に (タグ名, 要素) の組で返す
+        
+        selectolaxで解析した場合は、収集対象のタグのみをラッパーで包んで返す。
+        """
+        if self.tree is not None:
+            for node in self.tree.root.traverse():
+                name = node.tag
+                if name in _COLLECTED_TAGS:
+                    yield name, _LexborElement(node)
+        else:
+            for element in self.soup.descendants:
+                if isinstance(element, Tag):
+                    yield element.name, element
+    
+    def _collect_elements(self):
+        """
+        DOMを一度だけ走査し、各チェックが使用する要素をタグ名ごとに振り分ける
+        
+        インラインスタイルを参照するチェック用のリストには、そのチェックに
+        関係する宣言を含む要素のみを (要素, style値, 抽出した値の辞書) の
+        タプルとして格納する。
+        """
+        styled_blocks = self.styled_blocks = []
+        imgs = self.imgs = []
+        clickable = self.clickable = []
+        styled_clickable = self.styled_clickable = []
+        font_candidates = self.font_candidates = []
+        tables = self.tables = []
+        styles = self.styles = []
+        self.viewport_meta = None
+        styled = []
+        
+        for name, element in self._iter_tags():
+            style = element.get('style')
+            flags = _style_flags(style) if style and name in _STYLE_CHECK_TAGS else 0
+            if flags:
+                values = {}
+                styled.append((style, values))
+            if name in _BLOCK_TAGS:
+                if flags & _STYLE_WIDTH:
+                    styled_blocks.append((element, style, values))
+                if name == 'table':
+                    tables.append(element)
+            if name in _CLICKABLE_TAGS:
+                clickable.append(element)
+                if flags & (_STYLE_WIDTH | _STYLE_HEIGHT):
+                    styled_clickable.append((element, style, values))
+            if flags & _STYLE_FONT_SIZE and name in _TEXT_TAGS:
+                font_candidates.append((element, style, values))
+            if name == 'img':
+                imgs.append(element)
+            elif name == 'style':
+                styles.append(element)
+            elif name == 'meta' and self.viewport_meta is None and element.get('name') == 'viewport':
+                self.viewport_meta = element
+        
+        _extract_style_values(styled)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_parsed(url, expires):
+    """
+    URLのページを取得・解析した結果を返す
+    
+    同じURLを再分析する場合は取得・解析・要素の収集をやり直さずに結果を再利用する。
+    
+    Args:
+        url (str): 取得対象のURL
+        expires (int): キャッシュの有効期間の区切り（値が変わると再取得する）
+        
+    Returns:
+        _ParsedPage: ページの解析結果
+    """
+    # モバイルユーザーエージェントを使用
+    response = _get_session().get(url, headers=_MOBILE_HEADERS, timeout=30)
+    response.raise_for_status()
+    return _ParsedPage(response.text)
+
+
 class MobileAnalyzer:
     """Webサイトのモバイルフレンドリー性を分析するクラス"""
     
@@ -36,11 +392,12 @@ class MobileAnalyzer:
         self.domain = self.seo_analyzer.domain
         self.html = None
         self.soup = None
+        self.tree = None
+        self._page = None
+        self._fetch_lock = threading.Lock()
         
-        # データディレクトリの確認
-        self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        # データディレクトリ
+        self.data_dir = _DATA_DIR
     
     def _fetch_page(self):
         """
@@ -49,22 +406,53 @@ class MobileAnalyzer:
         Returns:
             bool: 取得成功の場合はTrue、失敗の場合はFalse
         """
-        if self.html:
-            return True
-            
+        # 複数スレッドから同時に呼ばれても取得は一度だけ行う
+        with self._fetch_lock:
+            if self._page is not None:
+                return True
+                
+            try:
+                page = _get_parsed(self.url, int(time.time() // _HTTP_CACHE_EXPIRE))
+                self._page = page
+                self.html = page.html
+                self.soup = page.soup
+                self.tree = page.tree
+                return True
+            except Exception as e:
+                logger.error(f"ページの取得に失敗しました: {str(e)}")
+                return False
+    
+    def _fetch_viewport_content(self):
+        """
+        ビューポートメタタグのcontent値を取得
+        
+        ページ全体を取得済みの場合は解析結果を使用する。未取得の場合は
+        レスポンスをストリームで読み込み、<head>の終わりまでだけを解析する。
+        
+        Returns:
+            tuple: (取得成功の場合はTrue, content値（タグがない場合はNone）)
+        """
+        if self._page is not None:
+            viewport_meta = self._page.viewport_meta
+            return True, viewport_meta.get('content', '') if viewport_meta else None
+        
         try:
-            # モバイルユーザーエージェントを使用
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
-            }
-            response = requests.get(self.url, headers=headers, timeout=30)
-            response.raise_for_status()
-            self.html = response.text
-            self.soup = BeautifulSoup(self.html, 'html.parser')
-            return True
+            response = _get_session().get(self.url, headers=_MOBILE_HEADERS, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                parser = _ViewportParser()
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+                try:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        parser.feed(decoder.decode(chunk))
+                except _HeadParsingFinished:
+                    pass
+                return True, parser.viewport_content
+            finally:
+                response.close()
         except Exception as e:
             logger.error(f"ページの取得に失敗しました: {str(e)}")
-            return False
+            return False, None
     
     def check_viewport(self):
         """
@@ -73,12 +461,11 @@ class MobileAnalyzer:
         Returns:
             dict: ビューポート分析結果
         """
-        if not self._fetch_page():
+        fetched, viewport_content = self._fetch_viewport_content()
+        if not fetched:
             return {'status': 'error', 'message': 'ページの取得に失敗しました'}
         
-        viewport_meta = self.soup.find('meta', attrs={'name': 'viewport'})
-        
-        if not viewport_meta:
+        if viewport_content is None:
             return {
                 'status': 'error',
                 'has_viewport': False,
@@ -86,8 +473,6 @@ class MobileAnalyzer:
                 'recommendation': 'ビューポートメタタグを追加してください: <meta name="viewport" content="width=device-width, initial-scale=1.0">'
             }
         
-        viewport_content = viewport_meta.get('content', '')
-        
         # 必要な設定が含まれているか確認
         has_width = 'width=device-width' in viewport_content or 'width=' in viewport_content
         has_initial_scale = 'initial-scale=' in viewport_content
@@ -118,52 +503,61 @@ class MobileAnalyzer:
         if not self._fetch_page():
             return {'status': 'error', 'message': 'ページの取得に失敗しました'}
         
-        # メディアクエリの確認
-        stylesheets = self.soup.find_all('link', rel='stylesheet')
-        style_tags = self.soup.find_all('style')
-        
         media_queries_count = 0
+        has_grid = False
         
-        # インラインスタイルタグ内のメディアクエリを確認
-        for style in style_tags:
-            if style.string and '@media' in style.string:
-                media_queries_count += len(re.findall(r'@media', style.string))
+        # インラインスタイルタグ内のメディアクエリとフレキシブルグリッドの使用を一度の走査で確認
+        for style in self._page.styles:
+            css = style.string
+            if not css:
+                continue
+            media_queries_count += css.count('@media')
+            if not has_grid and ('grid' in css or 'flex' in css):
+                has_grid = True
         
         # 固定幅の要素を確認
         fixed_width_elements = []
-        for element in self.soup.find_all(['div', 'table', 'section', 'article']):
-            style = element.get('style', '')
-            if style and ('width:' in style or 'width=' in style) and 'px' in style:
+        for element, style, values in self._page.styled_blocks:
+            if ('width:' in style or 'width=' in style) and 'px' in style:
                 # 幅が固定されている可能性がある要素
-                if not any(term in style for term in ['max-width', 'min-width']):
-                    width_match = re.search(r'width:\s*(\d+)px', style)
-                    if width_match and int(width_match.group(1)) > 320:
+                if 'max-width' not in style and 'min-width' not in style:
+                    width = values.get('width')
+                    if width and int(width) > 320:
                         fixed_width_elements.append({
                             'tag': element.name,
                             'style': style,
-                            'width': width_match.group(1) + 'px'
+                            'width': width + 'px'
                         })
         
         # 画像のレスポンシブ性を確認
-        images = self.soup.find_all('img')
+        images = self._page.imgs
         non_responsive_images = []
         
         for img in images:
             style = img.get('style', '')
             width = img.get('width', '')
+            # サイズ指定のない画像は判定対象外
+            if not style and not width:
+                continue
             
             # 固定幅の画像を検出
-            if (style and 'width:' in style and 'px' in style and 'max-width' not in style) or \
-               (width and width.isdigit() and int(width) > 320):
+            if style and 'width:' in style and 'px' in style and 'max-width' not in style:
+                is_fixed = True
+            else:
+                try:
+                    is_fixed = int(width) > 320
+                except ValueError:
+                    is_fixed = False
+            
+            if is_fixed:
+                if not width:
+                    width_match = _WIDTH_PX_RE.search(style)
+                    width = width_match.group(1) + 'px' if width_match else 'unknown'
                 non_responsive_images.append({
                     'src': img.get('src', ''),
-                    'width': width or re.search(r'width:\s*(\d+)px', style).group(1) + 'px' if re.search(r'width:\s*(\d+)px', style) else 'unknown'
+                    'width': width
                 })
         
-        # フレキシブルグリッドの使用を確認
-        has_grid = any('grid' in str(style) for style in style_tags) or \
-                  any('flex' in str(style) for style in style_tags)
-        
         # 結果の作成
         issues = []
         if media_queries_count == 0:
@@ -203,29 +597,20 @@ class MobileAnalyzer:
             return {'status': 'error', 'message': 'ページの取得に失敗しました'}
         
         # クリック可能な要素を取得
-        clickable_elements = self.soup.find_all(['a', 'button', 'input', 'select', 'textarea'])
+        clickable_elements = self._page.clickable
         
         small_elements = []
-        for element in clickable_elements:
-            style = element.get('style', '')
-            
+        for element, style, values in self._page.styled_clickable:
             # サイズが小さい要素を検出
-            width_match = re.search(r'width:\s*(\d+)px', style)
-            height_match = re.search(r'height:\s*(\d+)px', style)
+            width = values.get('width')
+            height = values.get('height')
             
-            if width_match and int(width_match.group(1)) < 44:
+            if (width is not None and int(width) < 44) or (height is not None and int(height) < 44):
                 small_elements.append({
                     'tag': element.name,
-                    'text': element.get_text()[:30] if element.get_text() else '',
-                    'width': width_match.group(1) + 'px',
-                    'height': height_match.group(1) + 'px' if height_match else 'unknown'
-                })
-            elif height_match and int(height_match.group(1)) < 44:
-                small_elements.append({
-                    'tag': element.name,
-                    'text': element.get_text()[:30] if element.get_text() else '',
-                    'width': width_match.group(1) + 'px' if width_match else 'unknown',
-                    'height': height_match.group(1) + 'px'
+                    'text': _peek_text(element),
+                    'width': width + 'px' if width is not None else 'unknown',
+                    'height': height + 'px' if height is not None else 'unknown'
                 })
         
         # 結果の作成
@@ -255,13 +640,12 @@ class MobileAnalyzer:
         small_font_elements = []
         
         # インラインスタイルでフォントサイズが設定されている要素を確認
-        for element in self.soup.find_all(['p', 'span', 'div', 'a', 'li', 'td']):
-            style = element.get('style', '')
-            if style and 'font-size:' in style:
-                font_size_match = re.search(r'font-size:\s*(\d+)(px|pt|rem|em)', style)
-                if font_size_match:
-                    size = float(font_size_match.group(1))
-                    unit = font_size_match.group(2)
+        for element, style, values in self._page.font_candidates:
+            if 'font-size:' in style:
+                font_size = values.get('font_size')
+                if font_size:
+                    size = float(font_size[0])
+                    unit = font_size[1]
                     
                     # 単位に応じて小さいフォントを判定
                     is_small = False
@@ -277,7 +661,7 @@ class MobileAnalyzer:
                     if is_small:
                         small_font_elements.append({
                             'tag': element.name,
-                            'text': element.get_text()[:30] if element.get_text() else '',
+                            'text': _peek_text(element),
                             'font_size': f"{size}{unit}"
                         })
         
@@ -306,18 +690,17 @@ class MobileAnalyzer:
         # 水平スクロールが必要になる可能性のある要素を検出
         overflow_elements = []
         
-        for element in self.soup.find_all(['div', 'table', 'section', 'article']):
-            style = element.get('style', '')
-            width_match = re.search(r'width:\s*(\d+)px', style)
+        for element, style, values in self._page.styled_blocks:
+            width = values.get('width')
             
-            if width_match and int(width_match.group(1)) > 320:
+            if width and int(width) > 320:
                 overflow_elements.append({
                     'tag': element.name,
-                    'width': width_match.group(1) + 'px'
+                    'width': width + 'px'
                 })
         
         # テーブルの確認
-        tables = self.soup.find_all('table')
+        tables = self._page.tables
         non_responsive_tables = []
         
         for table in tables:
@@ -357,6 +740,34 @@ class MobileAnalyzer:
             ] if issues else []
         }
     
+    @classmethod
+    def analyze_many(cls, urls, max_concurrency=8):
+        """
+        複数のURLのモバイルフレンドリー分析を並列に実行
+        
+        異なるドメインのページは並列に取得し、同一ドメインへのリクエストには
+        一定の間隔を空ける。
+        
+        Args:
+            urls (list): 分析対象のURLのリスト
+            max_concurrency (int, optional): 同時に分析するURLの最大数
+            
+        Returns:
+            list: 各URLの分析結果（urlsと同じ順序）
+        """
+        rate_limiter = _DomainRateLimiter(_DOMAIN_REQUEST_INTERVAL)
+        
+        def analyze_url(url):
+            rate_limiter.wait(url)
+            try:
+                return cls(url).analyze()
+            except Exception as e:
+                logger.error(f"モバイルフレンドリー分析に失敗しました: {url}: {str(e)}")
+                return {'url': url, 'status': 'error', 'message': str(e)}
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            return list(executor.map(analyze_url, urls))
+    
     def analyze(self):
         """
         モバイルフレンドリー分析を実行
@@ -369,12 +780,20 @@ class MobileAnalyzer:
         # 分析開始時刻
         start_time = time.time()
         
-        # 各チェックを実行
-        viewport_result = self.check_viewport()
-        responsive_result = self.check_responsive_design()
-        touch_result = self.check_touch_elements()
-        font_result = self.check_font_size()
-        content_width_result = self.check_content_width()
+        # ページを先に取得し、各チェックを並列に実行
+        self._fetch_page()
+        checks = (
+            self.check_viewport,
+            self.check_responsive_design,
+            self.check_touch_elements,
+            self.check_font_size,
+            self.check_content_width
+        )
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(check) for check in checks]
+            viewport_result, responsive_result, touch_result, font_result, content_width_result = [
+                future.result() for future in futures
+            ]
         
         # 総合スコアの計算
         score_components = []
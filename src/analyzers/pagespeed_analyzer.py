@@ -5,25 +5,137 @@ SEOマスターパッケージ - ページ速度分析モジュール
 ページサイズ、リソース数、画像最適化、キャッシュ設定、JavaScriptとCSSの最適化などを分析します。
 """
 
+import asyncio
 import logging
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 import urllib.parse
 import hashlib
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp が無い環境では requests で逐次取得する
+    aiohttp = None
+
 from src.core.analyzer import SEOAnalyzer
 
 # ロギングの設定
 logger = logging.getLogger(__name__)
 
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+# Content-Range: bytes 0-0/12345 の全体サイズ部分
+_CONTENT_RANGE_TOTAL_RE = re.compile(r'/(\d+)\s*$')
+
+# サイズは転送時のバイト数で測るため圧縮を要求しない
+_PROBE_HEADERS = {'Accept-Encoding': 'identity'}
+# Content-Lengthが得られない場合に全体サイズだけを問い合わせるためのヘッダー
+_RANGE_PROBE_HEADERS = {'Accept-Encoding': 'identity', 'Range': 'bytes=0-0'}
+
+# collect_resources で走査するタグ
+_RESOURCE_TAGS = ['script', 'link', 'style', 'img']
+
+# Linkヘッダーで提案するヒントの最大数
+_MAX_PRECONNECT_HINTS = 4
+_MAX_PRELOAD_HINTS = 3
+
+# リソースのメタ情報取得の同時実行数
+_META_CONCURRENCY = 16
+_META_TIMEOUT = 10
+
+# str.isspace() が真になる文字を削除する変換テーブル（該当文字はすべて U+3000 以下）
+_WHITESPACE_DELETE_TABLE = dict.fromkeys(c for c in range(0x3001) if chr(c).isspace())
+
+# キャッシュ設定が既知の主要CDN（ホスト名 -> Cache-Control）
+# これらのリソースはHEADリクエストを送らず、既知の値を使用する（サイズは取得しない）
+_KNOWN_CDN_CACHE_CONTROL = {
+    'fonts.googleapis.com': 'private, max-age=86400',
+    'fonts.gstatic.com': 'public, max-age=31536000',
+    'ajax.googleapis.com': 'public, max-age=31536000',
+    'cdnjs.cloudflare.com': 'public, max-age=30672000',
+    'cdn.jsdelivr.net': 'public, max-age=31536000',
+}
+
+
+def _known_cdn_meta(url):
+    """
+    既知のCDNのリソースであれば、既知のメタ情報を返す
+
+    Args:
+        url (str): リソースのURL
+
+    Returns:
+        tuple: (サイズ, キャッシュヘッダー情報)。既知のCDNでない場合はNone
+    """
+    host = (urllib.parse.urlparse(url).hostname or '').lower()
+    for cdn_host, cache_control in _KNOWN_CDN_CACHE_CONTROL.items():
+        if host == cdn_host or host.endswith('.' + cdn_host):
+            return 0, _parse_cache_headers({'Cache-Control': cache_control})
+    return None
+
+
+def _content_range_total(headers):
+    """
+    Content-Rangeヘッダーからリソース全体のサイズを取り出す
+
+    Args:
+        headers (Mapping): レスポンスヘッダー
+
+    Returns:
+        int: 全体サイズ（バイト）。取得できない場合はNone
+    """
+    match = _CONTENT_RANGE_TOTAL_RE.search(headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _parse_cache_headers(headers):
+    """
+    レスポンスヘッダーからキャッシュ情報を取り出す
+
+    Args:
+        headers (Mapping): レスポンスヘッダー（大文字小文字を区別しないもの）
+
+    Returns:
+        dict: キャッシュヘッダー情報
+    """
+    cache_control = headers.get('Cache-Control', '')
+    expires = headers.get('Expires', '')
+    etag = headers.get('ETag', '')
+    last_modified = headers.get('Last-Modified', '')
+
+    max_age = None
+    if 'max-age=' in cache_control:
+        max_age_match = _MAX_AGE_RE.search(cache_control)
+        if max_age_match:
+            max_age = int(max_age_match.group(1))
+
+    return {
+        'has_cache_headers': bool(cache_control or expires or etag or last_modified),
+        'cache_control': cache_control,
+        'expires': expires,
+        'etag': etag,
+        'last_modified': last_modified,
+        'max_age': max_age
+    }
+
 class PageSpeedAnalyzer:
     """Webサイトのページ速度を分析するクラス"""
     
+    __slots__ = (
+        'url', 'seo_analyzer', 'domain', 'tree', 'resources', 'data_dir',
+        '_session', '_probe_cache', '_resources_result', '_resources_parsed', '_collect_lock'
+    )
+    
     def __init__(self, url):
         """
         PageSpeedAnalyzerクラスの初期化
@@ -34,8 +146,24 @@ class PageSpeedAnalyzer:
         self.url = url
         self.seo_analyzer = SEOAnalyzer(url)
         self.domain = self.seo_analyzer.domain
-        self.html = None
-        self.soup = None
+        self.tree = None
+        
+        # 同一ホストへの接続を使い回すためのセッション
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'User-Agent': _USER_AGENT})
+        
+        # URLごとのリソース情報（サイズ, キャッシュヘッダー情報）のキャッシュ
+        self._probe_cache = {}
+        
+        # collect_resources の結果（収集済みの場合に再収集しないため保持）
+        self._resources_result = None
+        self._resources_parsed = False
+        self._collect_lock = threading.Lock()
+        
         self.resources = {
             'js': [],
             'css': [],
@@ -49,24 +177,50 @@ class PageSpeedAnalyzer:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
+    def close(self):
+        """HTTPセッションを閉じる"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def _fetch_page(self):
         """
         ページのHTMLを取得
         
+        レスポンス本文は文字列として保持せず、受信したチャンクを
+        そのままlxmlのパーサーに渡して解析します。
+        
         Returns:
             bool: 取得成功の場合はTrue、失敗の場合はFalse
         """
-        if self.html:
+        if self.tree is not None:
             return True
             
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(self.url, headers=headers, timeout=30)
-            response.raise_for_status()
-            self.html = response.text
-            self.soup = BeautifulSoup(self.html, 'html.parser')
+            response = self._session.get(self.url, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                
+                # ヘッダーで文字コードが指定されていない場合はmetaタグから判定させる
+                content_type = response.headers.get('Content-Type', '')
+                encoding = response.encoding if 'charset' in content_type.lower() else None
+                
+                parser = etree.HTMLParser(encoding=encoding)
+                for chunk in response.iter_content(chunk_size=65536):
+                    parser.feed(chunk)
+            finally:
+                response.close()
+            
+            try:
+                tree = parser.close()
+            except etree.XMLSyntaxError:
+                # 空のレスポンス
+                tree = None
+            self.tree = tree if tree is not None else etree.Element('html')
             return True
         except Exception as e:
             logger.error(f"ページの取得に失敗しました: {str(e)}")
@@ -82,221 +236,340 @@ class PageSpeedAnalyzer:
         Returns:
             str: 絶対URL
         """
-        if url.startswith('http://') or url.startswith('https://'):
-            return url
-        elif url.startswith('//'):
-            return 'https:' + url
-        elif url.startswith('/'):
-            parsed_url = urllib.parse.urlparse(self.url)
-            base = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            return base + url
-        else:
-            # 相対パスの場合
-            parsed_url = urllib.parse.urlparse(self.url)
-            path = parsed_url.path
-            if not path.endswith('/'):
-                path = path[:path.rfind('/')+1] if '/' in path else '/'
-            base = f"{parsed_url.scheme}://{parsed_url.netloc}{path}"
-            return base + url
+        return urllib.parse.urljoin(self.url, url)
     
-    def _get_resource_size(self, url):
+    def _probe_resource(self, url):
         """
-        リソースのサイズを取得
+        1回のHEADリクエストでリソースのサイズとキャッシュヘッダーを取得
         
         Args:
             url (str): リソースのURL
             
         Returns:
-            int: リソースのサイズ（バイト）
+            dict: サイズ（バイト）とキャッシュヘッダー情報
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Range': 'bytes=0-0'  # まずヘッダーだけを取得してContent-Lengthを確認
+            response = self._session.head(url, headers=_PROBE_HEADERS, timeout=_META_TIMEOUT, allow_redirects=True)
+            cache_info = _parse_cache_headers(response.headers)
+        except Exception as e:
+            logger.warning(f"リソース情報の取得に失敗しました: {url} - {str(e)}")
+            return {
+                'size': 0,
+                'cache': {
+                    'has_cache_headers': False,
+                    'error': str(e)
+                }
             }
-            response = requests.head(url, headers=headers, timeout=10)
-            
+        
+        # エラーレスポンスの場合はサイズを計測しない
+        if not response.ok:
+            return {'size': 0, 'cache': cache_info}
+        
+        # HEADで得たキャッシュヘッダー情報は、サイズの取得に失敗しても保持する
+        try:
             # Content-Lengthヘッダーがある場合
             if 'Content-Length' in response.headers:
-                return int(response.headers['Content-Length'])
+                return {'size': int(response.headers['Content-Length']), 'cache': cache_info}
             
-            # ヘッダーにサイズ情報がない場合は実際にダウンロード
-            response = requests.get(url, headers={'User-Agent': headers['User-Agent']}, timeout=10, stream=True)
-            response.raise_for_status()
-            
-            # ストリーミングでサイズを計算
-            size = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                size += len(chunk)
+            # ヘッダーにサイズ情報がない場合は先頭1バイトだけを要求し、Content-Rangeから全体サイズを得る
+            response = self._session.get(url, headers=_RANGE_PROBE_HEADERS, timeout=_META_TIMEOUT, stream=True)
+            try:
+                response.raise_for_status()
+                
+                size = _content_range_total(response.headers) if response.status_code == 206 else None
+                if size is None:
+                    # Rangeに対応していないサーバーはストリーミングでサイズを計算
+                    size = 0
+                    for chunk in response.iter_content(chunk_size=8192):
+                        size += len(chunk)
+            finally:
+                response.close()
             
-            return size
+            return {'size': size, 'cache': cache_info}
         except Exception as e:
             logger.warning(f"リソースサイズの取得に失敗しました: {url} - {str(e)}")
-            return 0
+            return {'size': 0, 'cache': cache_info}
     
-    def _check_cache_headers(self, url):
+    async def _fetch_meta(self, session, semaphore, url):
         """
-        キャッシュヘッダーを確認
-        
+        1回のHEADリクエストでリソースのサイズとキャッシュヘッダーを取得
+
         Args:
-            url (str): 確認するURL
-            
+            session (aiohttp.ClientSession): 使用するセッション
+            semaphore (asyncio.Semaphore): 同時実行数の制御
+            url (str): リソースのURL
+
         Returns:
-            dict: キャッシュヘッダー情報
+            tuple: (サイズ（バイト）, キャッシュヘッダー情報)
         """
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.head(url, headers=headers, timeout=10)
+        async with semaphore:
+            try:
+                async with session.head(url, headers=_PROBE_HEADERS, allow_redirects=True) as response:
+                    cache_info = _parse_cache_headers(response.headers)
+                    ok = response.ok
+                    content_length = response.headers.get('Content-Length')
+            except Exception as e:
+                logger.warning(f"リソース情報の取得に失敗しました: {url} - {str(e)}")
+                return 0, {
+                    'has_cache_headers': False,
+                    'error': str(e)
+                }
             
-            cache_control = response.headers.get('Cache-Control', '')
-            expires = response.headers.get('Expires', '')
-            etag = response.headers.get('ETag', '')
-            last_modified = response.headers.get('Last-Modified', '')
+            # エラーレスポンスの場合はサイズを計測しない
+            if not ok:
+                return 0, cache_info
             
-            has_cache_headers = bool(cache_control or expires or etag or last_modified)
-            max_age = None
+            # HEADで得たキャッシュヘッダー情報は、サイズの取得に失敗しても保持する
+            try:
+                if content_length is not None:
+                    return int(content_length), cache_info
+                
+                # Content-Lengthがない場合は先頭1バイトだけを要求し、Content-Rangeから全体サイズを得る
+                async with session.get(url, headers=_RANGE_PROBE_HEADERS) as response:
+                    response.raise_for_status()
+                    size = _content_range_total(response.headers) if response.status == 206 else None
+                    if size is None:
+                        # Rangeに対応していないサーバーはストリーミングでサイズを計算
+                        size = 0
+                        async for chunk in response.content.iter_chunked(8192):
+                            size += len(chunk)
+                
+                return size, cache_info
+            except Exception as e:
+                logger.warning(f"リソースサイズの取得に失敗しました: {url} - {str(e)}")
+                return 0, cache_info
+    
+    async def _gather_meta(self, urls):
+        """
+        複数リソースのメタ情報を並行して取得
+
+        Args:
+            urls (list): リソースのURLリスト
+
+        Returns:
+            dict: URLをキーとした (サイズ, キャッシュヘッダー情報) の辞書
+        """
+        semaphore = asyncio.Semaphore(_META_CONCURRENCY)
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8)
+        timeout = aiohttp.ClientTimeout(total=_META_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': _USER_AGENT}) as session:
+            results = await asyncio.gather(*[self._fetch_meta(session, semaphore, url) for url in urls])
+        return dict(zip(urls, results))
+    
+    def _fetch_resource_meta(self, urls):
+        """
+        リソースのサイズとキャッシュヘッダーをまとめて取得
+        
+        一度取得したURLは再取得しません。aiohttpが利用できない場合や、
+        既にイベントループが動作している場合はrequestsで逐次取得します。
+
+        Args:
+            urls (list): リソースのURLリスト
+
+        Returns:
+            dict: URLをキーとした (サイズ, キャッシュヘッダー情報) の辞書
+        """
+        missing = []
+        for url in dict.fromkeys(urls):
+            if url in self._probe_cache:
+                continue
+            known = _known_cdn_meta(url)
+            if known is not None:
+                self._probe_cache[url] = known
+            else:
+                missing.append(url)
+        
+        if missing:
+            fetched = None
+            if aiohttp is not None:
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    fetched = asyncio.run(self._gather_meta(missing))
             
-            if 'max-age=' in cache_control:
-                max_age_match = re.search(r'max-age=(\d+)', cache_control)
-                if max_age_match:
-                    max_age = int(max_age_match.group(1))
+            if fetched is None:
+                fetched = {}
+                for url in missing:
+                    probe = self._probe_resource(url)
+                    fetched[url] = (probe['size'], probe['cache'])
             
-            return {
-                'has_cache_headers': has_cache_headers,
-                'cache_control': cache_control,
-                'expires': expires,
-                'etag': etag,
-                'last_modified': last_modified,
-                'max_age': max_age
-            }
-        except Exception as e:
-            logger.warning(f"キャッシュヘッダーの確認に失敗しました: {url} - {str(e)}")
-            return {
-                'has_cache_headers': False,
-                'error': str(e)
-            }
+            self._probe_cache.update(fetched)
+        
+        return {url: self._probe_cache[url] for url in urls}
     
-    def collect_resources(self):
+    def _parse_resources(self):
         """
-        ページ内のリソースを収集
+        ページ内のリソースをHTMLから列挙してself.resourcesに格納
+        
+        サイズやキャッシュヘッダーの取得は行いません。
         
         Returns:
-            dict: 収集したリソース情報
+            bool: 成功の場合はTrue、ページの取得に失敗した場合はFalse
         """
+        if self._resources_parsed:
+            return True
+        
         if not self._fetch_page():
-            return {'status': 'error', 'message': 'ページの取得に失敗しました'}
-        
-        # JavaScriptファイル
-        for script in self.soup.find_all('script', src=True):
-            src = script.get('src')
-            if src:
-                absolute_url = self._get_absolute_url(src)
-                self.resources['js'].append({
-                    'url': absolute_url,
-                    'inline': False,
-                    'async': script.get('async') is not None,
-                    'defer': script.get('defer') is not None
-                })
-        
-        # インラインJavaScript
-        for script in self.soup.find_all('script', src=None):
-            if script.string and len(script.string.strip()) > 0:
-                # インラインスクリプトのハッシュを生成（識別用）
-                script_hash = hashlib.md5(script.string.encode()).hexdigest()[:8]
-                self.resources['js'].append({
-                    'url': f"inline-script-{script_hash}",
-                    'inline': True,
-                    'size': len(script.string),
-                    'minified': self._is_minified(script.string)
-                })
-        
-        # CSSファイル
-        for link in self.soup.find_all('link', rel='stylesheet'):
-            href = link.get('href')
-            if href:
-                absolute_url = self._get_absolute_url(href)
-                self.resources['css'].append({
-                    'url': absolute_url,
-                    'inline': False
-                })
-        
-        # インラインCSS
-        for style in self.soup.find_all('style'):
-            if style.string and len(style.string.strip()) > 0:
-                # インラインスタイルのハッシュを生成（識別用）
-                style_hash = hashlib.md5(style.string.encode()).hexdigest()[:8]
-                self.resources['css'].append({
-                    'url': f"inline-style-{style_hash}",
-                    'inline': True,
-                    'size': len(style.string),
-                    'minified': self._is_minified(style.string)
-                })
-        
-        # 画像
-        for img in self.soup.find_all('img', src=True):
-            src = img.get('src')
-            if src and not src.startswith('data:'):
-                absolute_url = self._get_absolute_url(src)
-                width = img.get('width', '')
-                height = img.get('height', '')
+            return False
+        
+        # 種類ごとの出現順を保つため、1回の走査で種類別のリストに振り分ける
+        external_js = []
+        inline_js = []
+        external_css = []
+        inline_css = []
+        images = []
+        preloaded_fonts = []
+        external_fonts = []
+        
+        for tag in self.tree.iter(*_RESOURCE_TAGS):
+            name = tag.tag
+            
+            if name == 'script':
+                src = tag.get('src')
+                if src is not None:
+                    # JavaScriptファイル
+                    if src:
+                        external_js.append({
+                            'url': self._get_absolute_url(src),
+                            'inline': False,
+                            'async': tag.get('async') is not None,
+                            'defer': tag.get('defer') is not None
+                        })
+                else:
+                    # インラインJavaScript（ハッシュを識別用に使用）
+                    text = tag.text
+                    if text and len(text.strip()) > 0:
+                        script_hash = hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+                        inline_js.append({
+                            'url': f"inline-script-{script_hash}",
+                            'inline': True,
+                            'size': len(text),
+                            'minified': self._is_minified(text)
+                        })
+            
+            elif name == 'style':
+                # インラインCSS（ハッシュを識別用に使用）
+                text = tag.text
+                if text and len(text.strip()) > 0:
+                    style_hash = hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+                    inline_css.append({
+                        'url': f"inline-style-{style_hash}",
+                        'inline': True,
+                        'size': len(text),
+                        'minified': self._is_minified(text)
+                    })
+            
+            elif name == 'img':
+                # 画像
+                src = tag.get('src')
+                if src and not src.startswith('data:'):
+                    width = tag.get('width', '')
+                    height = tag.get('height', '')
+                    images.append({
+                        'url': self._get_absolute_url(src),
+                        'width': width,
+                        'height': height,
+                        'has_dimensions': bool(width and height),
+                        'lazy_loading': tag.get('loading') == 'lazy'
+                    })
+            
+            else:
+                rel = (tag.get('rel') or '').split()
+                href = tag.get('href')
+                
+                # CSSファイル
+                if 'stylesheet' in rel and href:
+                    external_css.append({
+                        'url': self._get_absolute_url(href),
+                        'inline': False
+                    })
                 
-                self.resources['images'].append({
-                    'url': absolute_url,
-                    'width': width,
-                    'height': height,
-                    'has_dimensions': bool(width and height),
-                    'lazy_loading': img.get('loading') == 'lazy'
-                })
-        
-        # フォント
-        for link in self.soup.find_all('link', rel='preload'):
-            if link.get('as') == 'font':
-                href = link.get('href')
-                if href:
-                    absolute_url = self._get_absolute_url(href)
-                    self.resources['fonts'].append({
-                        'url': absolute_url,
+                # フォント
+                if 'preload' in rel and tag.get('as') == 'font' and href:
+                    preloaded_fonts.append({
+                        'url': self._get_absolute_url(href),
                         'preloaded': True
                     })
+                
+                # Google Fontsなどの外部フォント
+                href = href or ''
+                if 'fonts.googleapis.com' in href or 'fonts.gstatic.com' in href:
+                    external_fonts.append({
+                        'url': href,
+                        'preloaded': 'preload' in rel
+                    })
+        
+        self.resources['js'].extend(external_js + inline_js)
+        self.resources['css'].extend(external_css + inline_css)
+        self.resources['images'].extend(images)
+        self.resources['fonts'].extend(preloaded_fonts + external_fonts)
+        self._resources_parsed = True
         
-        # Google Fontsなどの外部フォント
-        for link in self.soup.find_all('link'):
-            href = link.get('href', '')
-            if 'fonts.googleapis.com' in href or 'fonts.gstatic.com' in href:
-                self.resources['fonts'].append({
-                    'url': href,
-                    'preloaded': link.get('rel') == 'preload'
-                })
+        # 列挙後は解析ツリーを参照しないため解放する
+        self.tree = None
+        return True
+    
+    def collect_resources(self):
+        """
+        ページ内のリソースを収集
+        
+        Returns:
+            dict: 収集したリソース情報
+        """
+        with self._collect_lock:
+            if self._resources_result is not None:
+                return self._resources_result
+            
+            if not self._parse_resources():
+                return {'status': 'error', 'message': 'ページの取得に失敗しました'}
+            
+            self._resources_result = self._probe_resources()
+            return self._resources_result
+    
+    def _probe_resources(self):
+        """
+        外部リソースのサイズとキャッシュヘッダーを取得し、集計結果を作成
         
-        # リソースのサイズと追加情報を取得
+        Returns:
+            dict: 収集したリソース情報
+        """
+        # 外部リソースのサイズとキャッシュヘッダーをまとめて取得
+        pending = [
+            resource
+            for resources in self.resources.values()
+            for resource in resources
+            if not resource.get('inline', False) and not resource.get('size', 0)
+        ]
+        meta = self._fetch_resource_meta([resource['url'] for resource in pending])
+        for resource in pending:
+            resource['size'], resource['cache'] = meta[resource['url']]
+        
+        # 種類ごとの件数とサイズを1回の走査で集計
+        counts = {}
+        sizes = {}
         for resource_type, resources in self.resources.items():
-            for i, resource in enumerate(resources):
-                if not resource.get('inline', False) and not resource.get('size', 0):
-                    # 外部リソースのサイズを取得
-                    size = self._get_resource_size(resource['url'])
-                    self.resources[resource_type][i]['size'] = size
-                    
-                    # キャッシュヘッダーを確認
-                    cache_info = self._check_cache_headers(resource['url'])
-                    self.resources[resource_type][i]['cache'] = cache_info
+            type_size = 0
+            for resource in resources:
+                type_size += resource.get('size', 0)
+            counts[resource_type] = len(resources)
+            sizes[resource_type] = type_size
         
         # 結果の作成
         result = {
             'status': 'ok',
             'resources': self.resources,
             'summary': {
-                'js_count': len(self.resources['js']),
-                'css_count': len(self.resources['css']),
-                'images_count': len(self.resources['images']),
-                'fonts_count': len(self.resources['fonts']),
-                'total_resources': sum(len(resources) for resources in self.resources.values()),
-                'js_size': sum(resource.get('size', 0) for resource in self.resources['js']),
-                'css_size': sum(resource.get('size', 0) for resource in self.resources['css']),
-                'images_size': sum(resource.get('size', 0) for resource in self.resources['images']),
-                'fonts_size': sum(resource.get('size', 0) for resource in self.resources['fonts']),
-                'total_size': sum(sum(resource.get('size', 0) for resource in resources) for resources in self.resources.values())
+                'js_count': counts['js'],
+                'css_count': counts['css'],
+                'images_count': counts['images'],
+                'fonts_count': counts['fonts'],
+                'total_resources': sum(counts.values()),
+                'js_size': sizes['js'],
+                'css_size': sizes['css'],
+                'images_size': sizes['images'],
+                'fonts_size': sizes['fonts'],
+                'total_size': sum(sizes.values())
             }
         }
         
@@ -321,13 +594,49 @@ class PageSpeedAnalyzer:
         # コンテンツの長さに対する改行の割合
         newline_ratio = newline_count / max(1, len(content))
         
-        # 空白文字の割合
-        whitespace_count = sum(1 for c in content if c.isspace())
+        # 空白文字の割合（空白を削除した長さとの差で数える）
+        whitespace_count = len(content) - len(content.translate(_WHITESPACE_DELETE_TABLE))
         whitespace_ratio = whitespace_count / max(1, len(content))
         
         # 改行が少なく、空白文字の割合が低い場合は最小化されていると判断
         return newline_ratio < 0.01 and whitespace_ratio < 0.1
     
+    def _build_link_header(self, blocking_css):
+        """
+        検出したリソースから preconnect / preload のLinkヘッダーを作成
+        
+        Args:
+            blocking_css (list): レンダリングをブロックするCSSリソース
+            
+        Returns:
+            str: Linkヘッダーの値（提案するヒントがない場合は空文字列）
+        """
+        parsed_page = urllib.parse.urlparse(self.url)
+        page_origin = f"{parsed_page.scheme}://{parsed_page.netloc}"
+        
+        # クロスオリジンのリソース配信元（出現順）
+        origins = {}
+        for resources in self.resources.values():
+            for resource in resources:
+                if resource.get('inline', False):
+                    continue
+                parsed = urllib.parse.urlparse(resource['url'])
+                if parsed.scheme in ('http', 'https') and parsed.netloc:
+                    origin = f"{parsed.scheme}://{parsed.netloc}"
+                    if origin != page_origin:
+                        origins.setdefault(origin, None)
+        
+        hints = [f'<{origin}>; rel=preconnect' for origin in list(origins)[:_MAX_PRECONNECT_HINTS]]
+        
+        # 文書の先頭に近いブロッキングCSSと、まだpreloadされていないフォントファイル
+        preloads = [f'<{resource["url"]}>; rel=preload; as=style' for resource in blocking_css]
+        for font in self.resources['fonts']:
+            if not font.get('preloaded') and 'fonts.googleapis.com' not in font['url']:
+                preloads.append(f'<{font["url"]}>; rel=preload; as=font; crossorigin')
+        hints.extend(preloads[:_MAX_PRELOAD_HINTS])
+        
+        return ', '.join(hints)
+    
     def check_render_blocking_resources(self):
         """
         レンダリングをブロックするリソースを確認
@@ -354,21 +663,30 @@ class PageSpeedAnalyzer:
                 if not media or media == 'all' or media == 'screen':
                     blocking_css.append(resource)
         
+        recommendations = [
+            'JavaScriptファイルにasyncまたはdefer属性を追加してください',
+            'クリティカルCSSをインライン化し、残りのCSSを非同期で読み込んでください',
+            'レンダリングに不要なJavaScriptは遅延読み込みしてください'
+        ] if blocking_js or blocking_css else []
+        
+        link_header = self._build_link_header(blocking_css)
+        if link_header:
+            recommendations.append(f'次のLinkヘッダー（またはlinkタグ）で接続の事前確立と重要リソースの先読みを指定してください: Link: {link_header}')
+        
         # 結果の作成
         return {
             'blocking_js_count': len(blocking_js),
             'blocking_css_count': len(blocking_css),
             'blocking_js': blocking_js[:5],  # 最初の5つのみ表示
             'blocking_css': blocking_css[:5],  # 最初の5つのみ表示
+            'link_header': link_header,
             'issues': [
-                f'{len(blocking_js)}個のJavaScriptファイルがレンダリングをブロックしています' if blocking_js else None,
-                f'{len(blocking_css)}個のCSSファイルがレンダリングをブロックしています' if blocking_css else None
+                issue for condition, issue in (
+                    (blocking_js, f'{len(blocking_js)}個のJavaScriptファイルがレンダリングをブロックしています'),
+                    (blocking_css, f'{len(blocking_css)}個のCSSファイルがレンダリングをブロックしています')
+                ) if condition
             ],
-            'recommendations': [
-                'JavaScriptファイルにasyncまたはdefer属性を追加してください',
-                'クリティカルCSSをインライン化し、残りのCSSを非同期で読み込んでください',
-                'レンダリングに不要なJavaScriptは遅延読み込みしてください'
-            ] if blocking_js or blocking_css else []
+            'recommendations': recommendations
         }
     
     def check_image_optimization(self):
@@ -410,9 +728,11 @@ class PageSpeedAnalyzer:
             'missing_dimensions': missing_dimensions[:5],  # 最初の5つのみ表示
             'non_lazy_images': non_lazy_images[:5],  # 最初の5つのみ表示
             'issues': [
-                f'{len(large_images)}個の画像が最適化されていない可能性があります' if large_images else None,
-                f'{len(missing_dimensions)}個の画像にwidth/height属性が設定されていません' if missing_dimensions else None,
-                f'{len(non_lazy_images)}個の画像に遅延読み込みが設定されていません' if non_lazy_images else None
+                issue for condition, issue in (
+                    (large_images, f'{len(large_images)}個の画像が最適化されていない可能性があります'),
+                    (missing_dimensions, f'{len(missing_dimensions)}個の画像にwidth/height属性が設定されていません'),
+                    (non_lazy_images, f'{len(non_lazy_images)}個の画像に遅延読み込みが設定されていません')
+                ) if condition
             ],
             'recommendations': [
                 '大きな画像は圧縮し、適切なフォーマット（WebP、AVIF）を使用してください',
@@ -452,8 +772,10 @@ class PageSpeedAnalyzer:
             'non_minified_js': non_minified_js[:5],  # 最初の5つのみ表示
             'non_minified_css': non_minified_css[:5],  # 最初の5つのみ表示
             'issues': [
-                f'{len(non_minified_js)}個のインラインJavaScriptが最小化されていません' if non_minified_js else None,
-                f'{len(non_minified_css)}個のインラインCSSが最小化されていません' if non_minified_css else None
+                issue for condition, issue in (
+                    (non_minified_js, f'{len(non_minified_js)}個のインラインJavaScriptが最小化されていません'),
+                    (non_minified_css, f'{len(non_minified_css)}個のインラインCSSが最小化されていません')
+                ) if condition
             ],
             'recommendations': [
                 'JavaScriptとCSSを最小化して、ファイルサイズを削減してください',
@@ -503,8 +825,10 @@ class PageSpeedAnalyzer:
             'non_cached_resources': non_cached_resources[:5],  # 最初の5つのみ表示
             'short_cache_resources': short_cache_resources[:5],  # 最初の5つのみ表示
             'issues': [
-                f'{len(non_cached_resources)}個のリソースにキャッシュヘッダーが設定されていません' if non_cached_resources else None,
-                f'{len(short_cache_resources)}個のリソースのキャッシュ期間が短すぎます' if short_cache_resources else None
+                issue for condition, issue in (
+                    (non_cached_resources, f'{len(non_cached_resources)}個のリソースにキャッシュヘッダーが設定されていません'),
+                    (short_cache_resources, f'{len(short_cache_resources)}個のリソースのキャッシュ期間が短すぎます')
+                ) if condition
             ],
             'recommendations': [
                 '静的リソース（JS、CSS、画像、フォント）には適切なキャッシュヘッダーを設定してください',
@@ -525,24 +849,34 @@ class PageSpeedAnalyzer:
         # 分析開始時刻
         start_time = time.time()
         
-        # リソースの収集
-        resources_result = self.collect_resources()
-        
-        if resources_result.get('status') == 'error':
+        # ページを取得してリソースを列挙
+        if not self._parse_resources():
             return {
                 'url': self.url,
                 'domain': self.domain,
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'analysis_duration': round(time.time() - start_time, 2),
                 'status': 'error',
-                'message': resources_result.get('message', 'リソースの収集に失敗しました')
+                'message': 'ページの取得に失敗しました'
             }
         
-        # 各チェックを実行
-        render_blocking_result = self.check_render_blocking_resources()
-        image_optimization_result = self.check_image_optimization()
-        minification_result = self.check_minification()
-        caching_result = self.check_caching()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # HTMLだけで判定できるチェックは、リソース情報の取得と並行して実行
+            early_futures = [
+                executor.submit(self.check_render_blocking_resources),
+                executor.submit(self.check_minification)
+            ]
+            
+            # 外部リソースのサイズとキャッシュヘッダーの取得
+            resources_result = self.collect_resources()
+            
+            # サイズとキャッシュヘッダーが必要なチェック
+            late_futures = [
+                executor.submit(self.check_image_optimization),
+                executor.submit(self.check_caching)
+            ]
+            render_blocking_result, minification_result = [future.result() for future in early_futures]
+            image_optimization_result, caching_result = [future.result() for future in late_futures]
         
         # 総合スコアの計算
         score_components = []
@@ -662,10 +996,10 @@ class PageSpeedAnalyzer:
             'minification': minification_result,
             'caching': caching_result,
             'summary': {
-                'total_issues': sum(1 for issue in render_blocking_result.get('issues', []) + 
-                                   image_optimization_result.get('issues', []) + 
-                                   minification_result.get('issues', []) + 
-                                   caching_result.get('issues', []) if issue)
+                'total_issues': (len(render_blocking_result.get('issues', [])) +
+                                 len(image_optimization_result.get('issues', [])) +
+                                 len(minification_result.get('issues', [])) +
+                                 len(caching_result.get('issues', [])))
             }
         }
         
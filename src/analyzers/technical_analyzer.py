@@ -1,10 +1,209 @@
 """
 SEOマスターパッケージの技術的SEO分析モジュール
 """
+import asyncio
+import codecs
+import copy
+import json
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3.util.connection
+from urllib3.util.retry import Retry
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 import time
-from bs4 import BeautifulSoup
 import re
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp が無い環境では create() も同期取得をスレッドで実行する
+    aiohttp = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # orjson が無い環境では標準のjsonでJSON-LDを解析する
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+# JSON-LD として解析できないスクリプトから @type を取り出す正規表現
+_LDJSON_TYPE_RE = re.compile(r'"@type"\s*:\s*"([^"]+)"')
+
+# style属性の簡易チェック用（幅40px未満・フォント12px未満・px指定の固定幅）
+_SMALL_WIDTH_RE = re.compile(r'width\s*:\s*(?:[1-9]|[12][0-9]|3[0-9])px')
+_SMALL_FONT_RE = re.compile(r'font-size\s*:\s*(?:[1-9]|1[01])px')
+_FIXED_PX_RE = re.compile(r'width\s*:\s*\d+px(?!.*%)')
+
+# ARIA属性が1つも無いページでDOMの走査を省くための事前チェック
+_ARIA_PREFIX_RE = re.compile(rb'aria-', re.IGNORECASE)
+
+# セキュリティヘッダー名（小文字）と分析結果のキーの対応
+_SEC_HEADERS = {
+    'strict-transport-security': 'hsts',
+    'content-security-policy': 'content_security_policy',
+    'x-content-type-options': 'x_content_type_options',
+    'x-frame-options': 'x_frame_options',
+    'x-xss-protection': 'x_xss_protection'
+}
+
+# 1回のクエリで取得するhead系タグと構造化データの要素
+# （セレクタリストだと両方に一致する要素が重複して返るため :is() でまとめる）
+_HEAD_SELECTOR = 'title, meta:is([name], [property]), link[rel]'
+_STRUCTURED_DATA_SELECTOR = ':is([itemtype], [typeof])'
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# 読み込むHTML本文の上限（バイト）。これを超える部分は解析対象にしない
+_MAX_BODY_BYTES = 5 * 1024 * 1024
+_CHUNK_SIZE = 65536
+
+# 非同期取得時にHTML解析・分析を実行するスレッドプール（イベントループを塞がないため）
+_PARSE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+# URLごとの分析結果キャッシュ（ETag / Last-Modified で再検証する）
+_ANALYSIS_CACHE_SIZE = 128
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# 名前解決結果のキャッシュ期間（秒）と保持するホスト数の上限
+_DNS_CACHE_TTL = 300
+_DNS_CACHE_SIZE = 1024
+_dns_cache = OrderedDict()
+_dns_cache_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(host, port):
+    """
+    TTL付きでキャッシュした名前解決結果を返す
+
+    Args:
+        host (str): ホスト名
+        port (int): ポート番号
+
+    Returns:
+        list: socket.getaddrinfo の結果
+    """
+    key = (host, port)
+    now = time.monotonic()
+    with _dns_cache_lock:
+        cached = _dns_cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                _dns_cache.move_to_end(key)
+                return cached[1]
+            del _dns_cache[key]
+    
+    family = urllib3.util.connection.allowed_gai_family()
+    infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    with _dns_cache_lock:
+        _dns_cache[key] = (now + _DNS_CACHE_TTL, infos)
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > _DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+    return infos
+
+
+def _evict_dns_cache(host, port):
+    """
+    名前解決結果をキャッシュから削除する
+
+    Args:
+        host (str): ホスト名
+        port (int): ポート番号
+    """
+    with _dns_cache_lock:
+        _dns_cache.pop((host, port), None)
+
+
+def _install_dns_cache():
+    """
+    urllib3（requests）の接続確立時に名前解決キャッシュを使うようにする
+
+    解決済みのIPアドレスで元の create_connection を呼び出すため、
+    TLSのSNIや証明書検証には元のホスト名がそのまま使われます。
+    """
+    original_create_connection = urllib3.util.connection.create_connection
+    if getattr(original_create_connection, '_uses_dns_cache', False):
+        return
+    
+    def create_connection(address, *args, **kwargs):
+        host, port = address
+        host = host.strip('[]')
+        try:
+            infos = _cached_getaddrinfo(host, port)
+        except OSError:
+            # 解決できない場合は元の処理に任せてエラーを報告させる
+            return original_create_connection(address, *args, **kwargs)
+        
+        error = None
+        for _, _, _, _, sockaddr in infos:
+            try:
+                return original_create_connection((sockaddr[0], port), *args, **kwargs)
+            except OSError as e:
+                error = e
+        
+        # どのアドレスにも接続できない場合は、次回解決し直すようにキャッシュから削除する
+        _evict_dns_cache(host, port)
+        if error is None:
+            error = OSError("getaddrinfo returned no addresses")
+        raise error
+    
+    create_connection._uses_dns_cache = True
+    urllib3.util.connection.create_connection = create_connection
+
+
+_install_dns_cache()
+
+
+def _collect_ld_types(data):
+    """
+    JSON-LDのオブジェクトから @type の値を出現順にすべて取り出す
+
+    @graph や配列のルート、入れ子のオブジェクトもたどります。
+
+    Args:
+        data: 解析済みのJSON-LD
+
+    Returns:
+        list: @type の値のリスト
+    """
+    types = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            type_value = node.get('@type')
+            if isinstance(type_value, str):
+                types.append(type_value)
+            elif isinstance(type_value, list):
+                types.extend(value for value in type_value if isinstance(value, str))
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return types
+
+
+def _create_session():
+    """
+    接続を使い回すためのrequestsセッションを作成
+
+    Returns:
+        requests.Session: リトライ設定付きのセッション
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                          max_retries=Retry(total=2, backoff_factor=0.3))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = _USER_AGENT
+    return session
 
 class TechnicalAnalyzer:
     """
@@ -12,23 +211,119 @@ class TechnicalAnalyzer:
     ステータスコード、レスポンス時間、モバイルフレンドリー、ページ速度などを分析します。
     """
     
-    def __init__(self, url):
+    __slots__ = (
+        'url', 'user_agent', 'timeout', 'response', 'response_time', 'tree',
+        '_body_bytes', '_html_content', '_meta_index', '_imgs', '_scripts',
+        '_links_css', '_divs', '_cached_results'
+    )
+    
+    # 全インスタンスで共有するセッション（Keep-Aliveと接続プールを再利用）
+    _session = _create_session()
+    
+    def __init__(self, url, only_headers=False):
         """
         技術的アナライザーを初期化します。
         
+        Args:
+            url (str): 分析対象のURL
+            only_headers (bool): Trueの場合はHEADリクエストでヘッダーのみ取得し、
+                HTMLの取得・解析を行いません（ステータスとセキュリティのみ分析可能）
+        """
+        self._init_state(url)
+        
+        # 初期データ取得
+        self._fetch_data(only_headers)
+    
+    def _init_state(self, url):
+        """
+        インスタンスの状態を初期化します（データの取得は行いません）。
+        
         Args:
             url (str): 分析対象のURL
         """
         self.url = url
-        self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        self.user_agent = _USER_AGENT
         self.timeout = 30
         self.response = None
         self.response_time = None
-        self.html_content = None
-        self.soup = None
+        self._body_bytes = None
+        self._html_content = None
+        self.tree = None
+        self._meta_index = None
+        self._imgs = []
+        self._scripts = []
+        self._links_css = []
+        self._divs = []
+        self._cached_results = None
+    
+    @classmethod
+    async def create(cls, url, session=None, only_headers=False):
+        """
+        非同期にデータを取得してアナライザーを作成します。
         
-        # 初期データ取得
-        self._fetch_data()
+        複数のURLを並行して分析する場合は、同じsessionを渡すことで
+        接続を使い回せます。
+        
+        Args:
+            url (str): 分析対象のURL
+            session (aiohttp.ClientSession, optional): 使用するセッション
+            only_headers (bool): Trueの場合はヘッダーのみ取得します
+            
+        Returns:
+            TechnicalAnalyzer: データ取得済みのアナライザー
+        """
+        if aiohttp is None:
+            return await asyncio.to_thread(cls, url, only_headers)
+        
+        self = cls.__new__(cls)
+        self._init_state(url)
+        
+        if session is None:
+            connector = aiohttp.TCPConnector(ttl_dns_cache=_DNS_CACHE_TTL)
+            async with aiohttp.ClientSession(connector=connector) as own_session:
+                await self._fetch_data_async(own_session, only_headers)
+        else:
+            await self._fetch_data_async(session, only_headers)
+        
+        return self
+    
+    @classmethod
+    async def analyze_many(cls, urls, max_concurrency=8):
+        """
+        複数のURLの技術的SEO分析を並行して実行します。
+        
+        取得は1つのaiohttpセッションで並行に行い、解析と分析はスレッドプールで実行します。
+        
+        Args:
+            urls (list): 分析対象のURLのリスト
+            max_concurrency (int, optional): 同時に分析するURLの最大数
+            
+        Returns:
+            list: 各URLの分析結果（urlsと同じ順序）
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def analyze_url(url, session):
+            async with semaphore:
+                try:
+                    analyzer = await cls.create(url, session=session)
+                    return await analyzer.analyze_async()
+                except Exception as e:
+                    print(f"Error analyzing URL {url}: {e}")
+                    return {'url': url, 'status': 'error', 'message': str(e)}
+        
+        async def run_all(session):
+            # 1件の失敗で他のタスクが取り消されないよう、例外はanalyze_url内で結果に変換する
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(analyze_url(url, session)) for url in urls]
+            return [task.result() for task in tasks]
+        
+        if aiohttp is None:
+            return await run_all(None)
+        
+        connector = aiohttp.TCPConnector(limit=max(1, max_concurrency), ttl_dns_cache=_DNS_CACHE_TTL)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await run_all(session)
     
     def analyze(self):
         """
@@ -37,6 +332,12 @@ class TechnicalAnalyzer:
         Returns:
             dict: 分析結果を含む辞書
         """
+        # 304 Not Modified の場合は前回の分析結果を再利用
+        if self._cached_results is not None and self._get_status_code() == 304:
+            results = copy.deepcopy(self._cached_results)
+            results['response_time'] = self.response_time
+            return results
+        
         results = {
             'status_code': self._get_status_code(),
             'response_time': self.response_time,
@@ -49,26 +350,271 @@ class TechnicalAnalyzer:
             'accessibility': self._check_accessibility()
         }
         
+        self._store_results(results)
+        
         return results
     
-    def _fetch_data(self):
+    async def analyze_async(self):
+        """
+        技術的SEO分析をスレッドプールで実行します。
+        
+        イベントループ上から呼び出す場合に、DOMの走査で他の処理を止めないために使います。
+        
+        Returns:
+            dict: 分析結果を含む辞書
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_PARSE_POOL, self.analyze)
+    
+    def _conditional_headers(self):
+        """
+        キャッシュ済みの分析結果があれば、再検証用のリクエストヘッダーを作成します。
+        
+        Returns:
+            dict: If-None-Match / If-Modified-Since ヘッダー
+        """
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(self.url)
+            if cached is not None:
+                _analysis_cache.move_to_end(self.url)
+        
+        if cached is None:
+            return {}
+        
+        validators, self._cached_results = cached
+        headers = {}
+        if validators['etag']:
+            headers['If-None-Match'] = validators['etag']
+        if validators['last_modified']:
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def _store_results(self, results):
+        """
+        ETag または Last-Modified を返したページの分析結果をキャッシュします。
+        
+        本文を解析していない結果（HEADリクエストでヘッダーのみ取得した場合など）は、
+        後の通常の分析で304が返ったときに空の結果を再利用してしまうためキャッシュしません。
+        
+        Args:
+            results (dict): 分析結果
+        """
+        if self._get_status_code() != 200 or self.tree is None:
+            return
+        
+        headers = self.response.headers
+        validators = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        }
+        if not validators['etag'] and not validators['last_modified']:
+            return
+        
+        with _analysis_cache_lock:
+            _analysis_cache[self.url] = (validators, copy.deepcopy(results))
+            _analysis_cache.move_to_end(self.url)
+            while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    
+    def _fetch_data(self, only_headers=False):
         """
         URLからデータを取得します。
+        
+        Args:
+            only_headers (bool): Trueの場合はHEADリクエストでヘッダーのみ取得します
         """
         try:
             start_time = time.time()
-            headers = {'User-Agent': self.user_agent}
-            self.response = requests.get(self.url, headers=headers, timeout=self.timeout)
+            if only_headers:
+                self.response = self._session.head(self.url, allow_redirects=True, timeout=self.timeout)
+            else:
+                self.response = self._session.get(self.url, headers=self._conditional_headers(),
+                                                  timeout=self.timeout, stream=True)
+                body = self._read_body()
             self.response_time = round((time.time() - start_time) * 1000)  # ミリ秒単位
             
-            if self.response.status_code == 200:
-                self.html_content = self.response.text
-                self.soup = BeautifulSoup(self.html_content, 'html.parser')
+            if not only_headers:
+                self._load_response(body)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching URL {self.url}: {e}")
             self.response = None
             self.response_time = None
     
+    def _read_body(self):
+        """
+        ストリーミング中のレスポンス本文を上限サイズまで読み込みます。
+        
+        200以外のレスポンスは解析しないため、本文は読み込まずに接続を閉じます。
+        
+        Returns:
+            bytes: 読み込んだ本文
+        """
+        response = self.response
+        try:
+            chunks = []
+            size = 0
+            if response.status_code == 200:
+                for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= _MAX_BODY_BYTES:
+                        break
+            body = b''.join(chunks)[:_MAX_BODY_BYTES]
+            response._content = body
+        finally:
+            response.close()
+        return body
+    
+    async def _fetch_data_async(self, session, only_headers=False):
+        """
+        aiohttpでURLからデータを取得します。
+        
+        取得結果はrequests.Responseに詰め替えるため、同期取得と同じ形で扱えます。
+        
+        Args:
+            session (aiohttp.ClientSession): 使用するセッション
+            only_headers (bool): Trueの場合はHEADリクエストでヘッダーのみ取得します
+        """
+        try:
+            start_time = time.time()
+            headers = {'User-Agent': self.user_agent}
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            if only_headers:
+                request = session.head(self.url, headers=headers, timeout=timeout, allow_redirects=True)
+            else:
+                headers.update(self._conditional_headers())
+                request = session.get(self.url, headers=headers, timeout=timeout)
+            async with request as resp:
+                chunks = []
+                size = 0
+                if not only_headers and resp.status == 200:
+                    async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= _MAX_BODY_BYTES:
+                            break
+                body = b''.join(chunks)[:_MAX_BODY_BYTES]
+                
+                response = requests.Response()
+                response.status_code = resp.status
+                response.reason = resp.reason
+                response.url = str(resp.url)
+                response.headers = CaseInsensitiveDict(resp.headers)
+                response.encoding = get_encoding_from_headers(response.headers)
+                response._content = body
+            
+            self.response = response
+            self.response_time = round((time.time() - start_time) * 1000)  # ミリ秒単位
+            
+            if not only_headers:
+                # 解析はCPU処理のため、イベントループの外で行う
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(_PARSE_POOL, self._load_response, body)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching URL {self.url}: {e}")
+            self.response = None
+            self.response_time = None
+    
+    @property
+    def html_content(self):
+        """
+        HTML本文の文字列（必要になった時点でデコードします）
+        
+        Returns:
+            str: HTML本文、取得できていない場合はNone
+        """
+        if self._html_content is None and self._body_bytes is not None:
+            encoding = self._declared_encoding() or 'utf-8'
+            self._html_content = self._body_bytes.decode(encoding, errors='replace')
+        return self._html_content
+    
+    def _declared_encoding(self):
+        """
+        Content-Typeヘッダーで指定されたUTF-8以外の文字コードを取得します。
+        
+        Returns:
+            str: 文字コード、指定が無いかUTF-8の場合はNone
+        """
+        content_type = self.response.headers.get('Content-Type') or ''
+        if 'charset' not in content_type.lower():
+            return None
+        encoding = get_encoding_from_headers(self.response.headers)
+        try:
+            if not encoding or codecs.lookup(encoding).name == 'utf-8':
+                return None
+        except LookupError:
+            # 未知の文字コードはUTF-8として扱う
+            return None
+        return encoding
+    
+    def _load_response(self, body):
+        """
+        取得したレスポンスからHTMLを読み込み、解析します。
+        
+        UTF-8（または文字コード指定なし）の場合はバイト列をそのままパーサーに渡し、
+        文字列へのデコードとコピーを省きます。
+        
+        Args:
+            body (bytes): レスポンス本文
+        """
+        if self.response.status_code == 200:
+            self._body_bytes = body
+            if self._declared_encoding() is None:
+                self.tree = LexborHTMLParser(self._body_bytes)
+            else:
+                self.tree = LexborHTMLParser(self.html_content)
+            self._scan_head_once()
+    
+    def _scan_head_once(self):
+        """
+        title・meta・linkタグを一度だけ走査してインデックスを作成し、
+        各チェックで使う要素リストもまとめて取得しておきます。
+        """
+        index = {
+            'title': None,
+            'description': None,
+            'keywords': None,
+            'robots': None,
+            'viewport': None,
+            'canonical': None,
+            'og': {},
+            'twitter': {}
+        }
+        links_css = []
+        
+        for node in self.tree.css(_HEAD_SELECTOR):
+            tag = node.tag
+            attributes = node.attributes
+            
+            if tag == 'title':
+                if index['title'] is None:
+                    index['title'] = node.text()
+            elif tag == 'meta':
+                content = attributes.get('content') or ''
+                name = attributes.get('name') or ''
+                if name in ('description', 'keywords', 'robots', 'viewport'):
+                    # 同名のタグが複数ある場合は最初のものを採用
+                    if index[name] is None:
+                        index[name] = content
+                elif name.startswith('twitter:') and len(name) > 8:
+                    index['twitter'][name[8:]] = content.strip()
+                
+                property_name = attributes.get('property') or ''
+                if property_name.startswith('og:') and len(property_name) > 3:
+                    index['og'][property_name[3:]] = content.strip()
+            else:
+                rel = (attributes.get('rel') or '').lower().split()
+                if 'canonical' in rel and index['canonical'] is None:
+                    index['canonical'] = attributes.get('href') or ''
+                if 'stylesheet' in rel:
+                    links_css.append(node)
+        
+        self._meta_index = index
+        self._links_css = links_css
+        self._imgs = self.tree.css('img')
+        self._scripts = self.tree.css('script')
+        self._divs = self.tree.css('div')
+    
     def _get_status_code(self):
         """
         HTTPステータスコードを取得します。
@@ -83,10 +629,10 @@ class TechnicalAnalyzer:
         ページサイズを取得します。
         
         Returns:
-            int: ページサイズ（バイト）
+            int: ページサイズ（展開後の本文のバイト数）
         """
-        if self.response and self.html_content:
-            return len(self.html_content)
+        if self.response and self._body_bytes:
+            return len(self._body_bytes)
         return 0
     
     def _analyze_meta_tags(self):
@@ -107,50 +653,16 @@ class TechnicalAnalyzer:
             'twitter': {}
         }
         
-        if not self.soup:
+        if self.tree is None:
             return meta_tags
         
-        # タイトル
-        title_tag = self.soup.find('title')
-        if title_tag:
-            meta_tags['title'] = title_tag.text.strip()
-        
-        # メタディスクリプション
-        meta_desc = self.soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            meta_tags['description'] = meta_desc.get('content', '').strip()
-        
-        # メタキーワード
-        meta_keywords = self.soup.find('meta', attrs={'name': 'keywords'})
-        if meta_keywords:
-            meta_tags['keywords'] = meta_keywords.get('content', '').strip()
-        
-        # ロボッツ
-        meta_robots = self.soup.find('meta', attrs={'name': 'robots'})
-        if meta_robots:
-            meta_tags['robots'] = meta_robots.get('content', '').strip()
-        
-        # ビューポート
-        meta_viewport = self.soup.find('meta', attrs={'name': 'viewport'})
-        if meta_viewport:
-            meta_tags['viewport'] = meta_viewport.get('content', '').strip()
-        
-        # カノニカル
-        canonical = self.soup.find('link', attrs={'rel': 'canonical'})
-        if canonical:
-            meta_tags['canonical'] = canonical.get('href', '').strip()
-        
-        # OGタグ
-        for og_tag in self.soup.find_all('meta', attrs={'property': re.compile('^og:')}):
-            property_name = og_tag.get('property', '').replace('og:', '')
-            if property_name:
-                meta_tags['og'][property_name] = og_tag.get('content', '').strip()
-        
-        # Twitterカード
-        for twitter_tag in self.soup.find_all('meta', attrs={'name': re.compile('^twitter:')}):
-            property_name = twitter_tag.get('name', '').replace('twitter:', '')
-            if property_name:
-                meta_tags['twitter'][property_name] = twitter_tag.get('content', '').strip()
+        index = self._meta_index
+        for key in ('title', 'description', 'keywords', 'robots', 'viewport', 'canonical'):
+            if index[key] is not None:
+                meta_tags[key] = index[key].strip()
+        
+        meta_tags['og'] = dict(index['og'])
+        meta_tags['twitter'] = dict(index['twitter'])
         
         return meta_tags
     
@@ -169,13 +681,13 @@ class TechnicalAnalyzer:
             'content_width': False
         }
         
-        if not self.soup:
+        if self.tree is None:
             return results
         
         # ビューポートの存在チェック
-        viewport = self.soup.find('meta', attrs={'name': 'viewport'})
-        if viewport:
-            viewport_content = viewport.get('content', '').lower()
+        viewport = self._meta_index['viewport']
+        if viewport is not None:
+            viewport_content = viewport.lower()
             results['viewport_present'] = True
             
             # レスポンシブデザインのチェック
@@ -184,28 +696,28 @@ class TechnicalAnalyzer:
         
         # タッチ要素のサイズチェック（簡易版）
         small_elements = 0
-        for a in self.soup.find_all('a'):
+        for a in self.tree.css('a'):
             # スタイル属性から幅と高さを抽出（実際にはもっと複雑な分析が必要）
-            style = a.get('style', '')
-            if 'width' in style and any(f"{i}px" in style for i in range(1, 40)):
+            style = a.attributes.get('style')
+            if style and _SMALL_WIDTH_RE.search(style):
                 small_elements += 1
         
         results['touch_elements_size'] = small_elements == 0
         
         # フォントサイズのチェック（簡易版）
         small_fonts = 0
-        for font_tag in self.soup.find_all(['font', 'span', 'p', 'div']):
-            style = font_tag.get('style', '')
-            if 'font-size' in style and any(f"{i}px" in style for i in range(1, 12)):
+        for font_tag in self.tree.css('font, span, p, div'):
+            style = font_tag.attributes.get('style')
+            if style and _SMALL_FONT_RE.search(style):
                 small_fonts += 1
         
         results['font_size'] = small_fonts == 0
         
         # コンテンツ幅のチェック（簡易版）
         fixed_width = 0
-        for div in self.soup.find_all('div'):
-            style = div.get('style', '')
-            if 'width' in style and 'px' in style and not '%' in style:
+        for div in self._divs:
+            style = div.attributes.get('style')
+            if style and _FIXED_PX_RE.search(style):
                 fixed_width += 1
         
         results['content_width'] = fixed_width == 0
@@ -230,23 +742,20 @@ class TechnicalAnalyzer:
             'total_requests': 0
         }
         
-        if not self.soup or not self.html_content:
+        if self.tree is None or not self._body_bytes:
             return results
         
         # HTML サイズ
-        results['html_size'] = len(self.html_content)
+        results['html_size'] = self._get_page_size()
         
         # 画像数
-        images = self.soup.find_all('img')
-        results['image_count'] = len(images)
+        results['image_count'] = len(self._imgs)
         
         # スクリプト数
-        scripts = self.soup.find_all('script')
-        results['script_count'] = len(scripts)
+        results['script_count'] = len(self._scripts)
         
         # CSS数
-        css_links = self.soup.find_all('link', attrs={'rel': 'stylesheet'})
-        results['css_count'] = len(css_links)
+        results['css_count'] = len(self._links_css)
         
         # 合計リクエスト数（推定）
         results['total_requests'] = 1 + results['image_count'] + results['script_count'] + results['css_count']
@@ -267,44 +776,65 @@ class TechnicalAnalyzer:
             'types': []
         }
         
-        if not self.soup:
+        if self.tree is None:
             return results
         
-        # JSON-LD
-        json_ld_scripts = self.soup.find_all('script', attrs={'type': 'application/ld+json'})
+        # 重複チェック用（出力順は検出順のまま保つ）
+        seen_types = set()
+        
+        # JSON-LD（取得済みのscript要素から絞り込む）
+        json_ld_scripts = [
+            script for script in self._scripts
+            if (script.attributes.get('type') or '').lower() == 'application/ld+json'
+        ]
         if json_ld_scripts:
             results['json_ld'] = True
             
-            # 簡易的な型抽出（実際にはJSONをパースして詳細分析が必要）
             for script in json_ld_scripts:
-                content = script.string
-                if content:
-                    if '"@type"' in content:
-                        type_match = re.search(r'"@type"\s*:\s*"([^"]+)"', content)
-                        if type_match and type_match.group(1) not in results['types']:
-                            results['types'].append(type_match.group(1))
+                content = script.text()
+                if not content or '"@type"' not in content:
+                    continue
+                
+                try:
+                    ld_types = _collect_ld_types(_json_loads(content))
+                except _JSONDecodeError:
+                    # 壊れたJSONでも最初の @type だけは拾っておく
+                    type_match = _LDJSON_TYPE_RE.search(content)
+                    ld_types = [type_match.group(1)] if type_match else []
+                
+                for ld_type in ld_types:
+                    if ld_type not in seen_types:
+                        seen_types.add(ld_type)
+                        results['types'].append(ld_type)
+        
+        # MicrodataとRDFaの要素を1回のクエリで取得し、それぞれの出現順で振り分ける
+        itemtypes = []
+        typeofs = []
+        for element in self.tree.css(_STRUCTURED_DATA_SELECTOR):
+            attributes = element.attributes
+            if 'itemtype' in attributes:
+                itemtypes.append(attributes.get('itemtype') or '')
+            if 'typeof' in attributes:
+                typeofs.append(attributes.get('typeof') or '')
         
         # Microdata
-        microdata_elements = self.soup.find_all(attrs={'itemtype': True})
-        if microdata_elements:
+        if itemtypes:
             results['microdata'] = True
             
-            for element in microdata_elements:
-                itemtype = element.get('itemtype', '')
-                if itemtype and itemtype not in results['types']:
-                    # URLから型名を抽出
-                    type_name = itemtype.split('/')[-1]
-                    if type_name:
-                        results['types'].append(type_name)
+            for itemtype in itemtypes:
+                # URLから型名を抽出
+                type_name = itemtype.split('/')[-1]
+                if type_name and type_name not in seen_types:
+                    seen_types.add(type_name)
+                    results['types'].append(type_name)
         
         # RDFa
-        rdfa_elements = self.soup.find_all(attrs={'typeof': True})
-        if rdfa_elements:
+        if typeofs:
             results['rdfa'] = True
             
-            for element in rdfa_elements:
-                typeof = element.get('typeof', '')
-                if typeof and typeof not in results['types']:
+            for typeof in typeofs:
+                if typeof and typeof not in seen_types:
+                    seen_types.add(typeof)
                     results['types'].append(typeof)
         
         return results
@@ -331,23 +861,11 @@ class TechnicalAnalyzer:
         # HTTPS
         results['https'] = self.url.startswith('https://')
         
-        # セキュリティヘッダー
-        headers = self.response.headers
-        
-        # HSTS
-        results['hsts'] = 'Strict-Transport-Security' in headers
-        
-        # Content-Security-Policy
-        results['content_security_policy'] = 'Content-Security-Policy' in headers
-        
-        # X-Content-Type-Options
-        results['x_content_type_options'] = 'X-Content-Type-Options' in headers
-        
-        # X-Frame-Options
-        results['x_frame_options'] = 'X-Frame-Options' in headers
-        
-        # X-XSS-Protection
-        results['x_xss_protection'] = 'X-XSS-Protection' in headers
+        # セキュリティヘッダー（ヘッダーを1回だけ走査する）
+        for name in self.response.headers:
+            key = _SEC_HEADERS.get(name.lower())
+            if key:
+                results[key] = True
         
         return results
     
@@ -365,36 +883,41 @@ class TechnicalAnalyzer:
             'form_labels': 0
         }
         
-        if not self.soup:
+        if self.tree is None:
             return results
         
         # alt属性
-        images = self.soup.find_all('img')
-        images_with_alt = [img for img in images if img.get('alt') is not None]
+        images = self._imgs
+        images_with_alt = [img for img in images if 'alt' in img.attributes]
         results['alt_attributes'] = len(images_with_alt) / len(images) if images else 1
         
         # ARIA属性
-        aria_elements = self.soup.find_all(attrs=lambda attr: hasattr(attr, 'keys') and any(key.startswith('aria-') for key in attr.keys()))
-        results['aria_attributes'] = len(aria_elements)
+        aria_count = 0
+        if self._body_bytes and _ARIA_PREFIX_RE.search(self._body_bytes):
+            for node in self.tree.root.traverse():
+                for key in node.attributes:
+                    if key.startswith('aria-'):
+                        aria_count += 1
+                        break
+        results['aria_attributes'] = aria_count
         
         # lang属性
-        html_tag = self.soup.find('html')
-        results['lang_attribute'] = html_tag and html_tag.get('lang') is not None
+        html_tag = self.tree.css_first('html')
+        results['lang_attribute'] = html_tag and 'lang' in html_tag.attributes
         
         # フォームラベル
-        forms = self.soup.find_all('form')
-        form_inputs = []
-        for form in forms:
-            form_inputs.extend(form.find_all(['input', 'textarea', 'select']))
+        form_inputs = self.tree.css('form input, form textarea, form select')
+        
+        # for属性で参照されているIDの集合（入力要素ごとにlabelを探し直さない）
+        label_for = {label.attributes.get('for') for label in self.tree.css('label[for]')}
         
         labeled_inputs = 0
         for input_element in form_inputs:
-            input_id = input_element.get('id')
+            input_id = input_element.attributes.get('id')
             if input_id:
-                label = self.soup.find('label', attrs={'for': input_id})
-                if label:
+                if input_id in label_for:
                     labeled_inputs += 1
-            elif input_element.parent.name == 'label':
+            elif input_element.parent.tag == 'label':
                 labeled_inputs += 1
         
         results['form_labels'] = labeled_inputs / len(form_inputs) if form_inputs else 1
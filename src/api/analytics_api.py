@@ -5,15 +5,25 @@ SEOマスターパッケージ - Google Analytics連携モジュール
 トラフィック、ユーザー行動、コンバージョン、ページパフォーマンスなどのデータを取得し分析します。
 """
 
+import bisect
+import copy
+import functools
+import inspect
 import logging
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
+import tldextract
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:  # orjson が無い環境では標準のjsonで出力する
+    orjson = None
+
 # モックモードでの動作のため、実際のGoogle APIクライアントはコメントアウト
 # from googleapiclient.discovery import build
 # from google.oauth2.credentials import Credentials
@@ -23,6 +33,150 @@ from src.core.analyzer import SEOAnalyzer
 # ロギングの設定
 logger = logging.getLogger(__name__)
 
+# モックデータの定義
+# トラフィックソース: (ソース, メディア, 全セッションに対する割合の下限, 上限)
+_SOURCE_SPEC = (
+    ('google', 'organic', 0.4, 0.6),
+    ('direct', 'none', 0.15, 0.25),
+    ('google', 'cpc', 0.05, 0.15),
+    ('facebook', 'social', 0.05, 0.1),
+    ('twitter', 'social', 0.02, 0.05),
+    ('linkedin', 'social', 0.01, 0.03),
+    ('bing', 'organic', 0.02, 0.05),
+    ('yahoo', 'organic', 0.01, 0.03),
+    ('referral', 'referral', 0.05, 0.1),
+    ('email', 'email', 0.01, 0.05)
+)
+
+# デバイスカテゴリ: (カテゴリ, 割合の下限, 上限)
+_DEVICE_SPEC = (
+    ('mobile', 0.5, 0.7),
+    ('desktop', 0.25, 0.45),
+    ('tablet', 0.05, 0.1)
+)
+
+# 国: (国名, 割合の下限, 上限)
+_COUNTRY_SPEC = (
+    ('Japan', 0.6, 0.8),
+    ('United States', 0.05, 0.15),
+    ('China', 0.02, 0.05),
+    ('South Korea', 0.01, 0.03),
+    ('United Kingdom', 0.01, 0.03),
+    ('Germany', 0.005, 0.02),
+    ('France', 0.005, 0.02),
+    ('Canada', 0.005, 0.02),
+    ('Australia', 0.005, 0.02),
+    ('Other', 0.01, 0.05)
+)
+
+# サイトURLに続けるページのパス
+_MOCK_PAGE_PATHS = (
+    '', 'about/', 'services/', 'contact/', 'blog/', 'blog/seo-tips/',
+    'blog/content-marketing/', 'blog/keyword-research/', 'products/', 'faq/'
+)
+
+# イベントカテゴリとアクション
+_EVENT_CATEGORIES = ('engagement', 'outbound', 'download', 'video', 'form', 'scroll', 'click')
+_EVENT_ACTIONS = {
+    'engagement': ('read', 'share', 'comment', 'like'),
+    'outbound': ('click', 'navigate'),
+    'download': ('pdf', 'doc', 'zip', 'image'),
+    'video': ('play', 'pause', 'complete', '25%', '50%', '75%'),
+    'form': ('start', 'submit', 'error', 'complete'),
+    'scroll': ('25%', '50%', '75%', '100%'),
+    'click': ('button', 'link', 'image', 'menu')
+}
+
+# イベントあたりの値を持つカテゴリ
+_VALUED_EVENT_CATEGORIES = frozenset(('engagement', 'download', 'form'))
+
+# モックで生成する (カテゴリ, アクション) の組（各カテゴリから最大2つのアクションを使用）と、値を持つイベントのマスク
+_EVENT_PAIRS = tuple(
+    (category, action)
+    for category in _EVENT_CATEGORIES
+    for action in _EVENT_ACTIONS.get(category, ())[:2]
+)
+_EVENT_VALUED_MASK = np.array([category in _VALUED_EVENT_CATEGORIES for category, _ in _EVENT_PAIRS])
+
+# 評価の閾値表（昇順）とそれぞれの区間に対応するスコア・評価
+# 直帰率は低いほど良い（閾値未満で上の区間）ため bisect_right、それ以外は閾値を超えたら上の区間のため bisect_left で引く
+_BOUNCE_THRESHOLDS = (30, 50, 70)
+_BOUNCE_SCORES = (30, 20, 10, 0)
+_PAGES_PER_SESSION_THRESHOLDS = (1.5, 2, 3)
+_PAGES_PER_SESSION_SCORES = (0, 10, 20, 30)
+_DURATION_THRESHOLDS = (60, 120, 180)
+_DURATION_SCORES = (10, 20, 30, 40)
+_TRAFFIC_THRESHOLDS = (1000, 5000, 10000)
+_ENGAGEMENT_THRESHOLDS = (40, 60, 80)
+_RATINGS = ('改善の余地あり', '普通', '良好', '非常に良好')
+
+def _json_default(obj):
+    """標準のjsonで扱えないNumPyの値をPythonの値に変換"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj):
+    """
+    分析結果をJSON文字列に変換（orjsonがあればそちらを使用）
+    
+    Args:
+        obj: 変換するオブジェクト
+        
+    Returns:
+        str: JSON文字列
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+# 取得・分析結果を再利用する期間（秒）。モックモードでは期限なし
+_CACHE_TTL = 300
+
+def _ttl_cached(method):
+    """
+    引数ごとに結果をインスタンス内へキャッシュするデコレータ
+    
+    位置引数とキーワード引数の違いやデフォルト値の省略があっても、
+    同じ引数であれば同じキャッシュを使います。呼び出し側での変更が
+    キャッシュや以降の結果に影響しないよう、常に複製を返します。
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.values())[1:]
+        
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and (self.mock_mode or now - cached[0] < _CACHE_TTL):
+            return copy.deepcopy(cached[1])
+        
+        result = method(self, *args, **kwargs)
+        self._cache[key] = (now, result)
+        return copy.deepcopy(result)
+    
+    return wrapper
+
+def _half_trend(values):
+    """
+    期間の前半と後半の合計を比較した増減率を計算
+    
+    Args:
+        values (numpy.ndarray): 日ごとの値
+        
+    Returns:
+        float: 前半に対する後半の増減率（%）、前半が0の場合は0
+    """
+    half = len(values) // 2
+    first_half = int(values[:half].sum())
+    if not first_half:
+        return 0
+    second_half = int(values[half:].sum())
+    return round((second_half - first_half) / first_half * 100, 1)
+
 class AnalyticsAnalyzer:
     """Google Analyticsと連携してデータを分析するクラス"""
     
@@ -36,12 +190,18 @@ class AnalyticsAnalyzer:
             mock_mode (bool, optional): モックモードを使用するかどうか（APIキーがない場合など）
         """
         self.url = url
-        self.seo_analyzer = SEOAnalyzer(url)
-        self.domain = self.seo_analyzer.domain
+        self.domain = self._extract_domain(url)
+        self._seo_analyzer = None
         self.credentials_file = credentials_file
         self.mock_mode = mock_mode
         self.service = None
         
+        # モックデータ生成用の乱数生成器
+        self._rng = np.random.default_rng()
+        
+        # 取得・分析結果のキャッシュ（キー: メソッド名と引数、値: (取得時刻, 結果)）
+        self._cache = {}
+        
         # データディレクトリの確認
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
         if not os.path.exists(self.data_dir):
@@ -51,6 +211,36 @@ class AnalyticsAnalyzer:
         if not self.mock_mode and self.credentials_file:
             self._init_service()
     
+    @property
+    def seo_analyzer(self):
+        """
+        SEOアナライザー（ページの取得と解析を伴うため、最初に使われた時点で作成）
+        
+        Returns:
+            SEOAnalyzer: 分析対象URLのSEOアナライザー
+        """
+        if self._seo_analyzer is None:
+            self._seo_analyzer = SEOAnalyzer(self.url)
+        return self._seo_analyzer
+    
+    @staticmethod
+    def _extract_domain(url):
+        """
+        URLからドメイン名を抽出（SEOAnalyzer.domain と同じ形式）
+        
+        Args:
+            url (str): 抽出対象のURL
+            
+        Returns:
+            str: ドメイン名
+        """
+        try:
+            extracted = tldextract.extract(url)
+            return f"{extracted.domain}.{extracted.suffix}"
+        except Exception as e:
+            logger.error(f"ドメインの抽出に失敗しました: {url}: {str(e)}")
+            return ""
+    
     def _init_service(self):
         """Google Analytics APIサービスを初期化"""
         try:
@@ -62,6 +252,7 @@ class AnalyticsAnalyzer:
             logger.error(f"Google Analytics APIの初期化に失敗しました: {str(e)}")
             self.mock_mode = True
     
+    @_ttl_cached
     def get_traffic_data(self, days=30):
         """
         トラフィックデータを取得
@@ -80,143 +271,97 @@ class AnalyticsAnalyzer:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days)
             
-            # 日付ごとのデータを生成
-            date_range = pd.date_range(start=start_date, end=end_date)
-            date_data = []
+            # 日付ごとのデータを生成（開始日から終了日までの日単位の配列）
+            dates = np.datetime64(start_date, 'D') + np.arange(days + 1)
             
             # 基準となるセッション数（徐々に増加するトレンドを作成）
-            base_sessions = np.random.randint(100, 500)
-            
-            for i, date in enumerate(date_range):
-                date_str = date.strftime('%Y-%m-%d')
-                
-                # 曜日効果（週末は少し減少）
-                weekday_factor = 0.8 if date.weekday() >= 5 else 1.0
-                
-                # トレンド効果（徐々に増加）
-                trend_factor = 1.0 + (i / len(date_range)) * 0.2
-                
-                # ランダム変動
-                random_factor = np.random.uniform(0.8, 1.2)
-                
-                # セッション数の計算
-                sessions = int(base_sessions * weekday_factor * trend_factor * random_factor)
-                
-                # ユーザー数はセッション数の80-95%
-                users = int(sessions * np.random.uniform(0.8, 0.95))
-                
-                # 新規ユーザーはユーザー数の20-40%
-                new_users = int(users * np.random.uniform(0.2, 0.4))
-                
-                # ページビュー数はセッション数の2-4倍
-                pageviews = int(sessions * np.random.uniform(2.0, 4.0))
-                
-                # セッションあたりのページ数
-                pages_per_session = round(pageviews / sessions, 2)
-                
-                # 平均セッション時間（秒）
-                avg_session_duration = int(np.random.uniform(60, 300))
-                
-                # 直帰率
-                bounce_rate = round(np.random.uniform(30, 70), 2)
-                
-                date_data.append({
-                    'date': date_str,
-                    'sessions': sessions,
-                    'users': users,
-                    'new_users': new_users,
-                    'pageviews': pageviews,
-                    'pages_per_session': pages_per_session,
-                    'avg_session_duration': avg_session_duration,
-                    'bounce_rate': bounce_rate
-                })
+            base_sessions = self._rng.integers(100, 500)
+            
+            # 日ごとの指標を配列でまとめて生成
+            n = len(dates)
+            
+            # 曜日効果（週末は少し減少）
+            # datetime64[D] は1970-01-01（木曜日）からの日数なので、+3して月曜日=0の曜日に変換
+            weekday_factor = np.where((dates.astype(np.int64) + 3) % 7 >= 5, 0.8, 1.0)
+            
+            # トレンド効果（徐々に増加）
+            trend_factor = 1.0 + np.arange(n) / n * 0.2
+            
+            # ランダム変動
+            random_factor = self._rng.uniform(0.8, 1.2, n)
+            
+            # セッション数の計算
+            sessions = (base_sessions * weekday_factor * trend_factor * random_factor).astype(np.int64)
+            
+            # ユーザー数はセッション数の80-95%
+            users = (sessions * self._rng.uniform(0.8, 0.95, n)).astype(np.int64)
+            
+            # 新規ユーザーはユーザー数の20-40%
+            new_users = (users * self._rng.uniform(0.2, 0.4, n)).astype(np.int64)
+            
+            # ページビュー数はセッション数の2-4倍
+            pageviews = (sessions * self._rng.uniform(2.0, 4.0, n)).astype(np.int64)
+            
+            # セッションあたりのページ数
+            pages_per_session = np.round(pageviews / sessions, 2)
+            
+            # 平均セッション時間（秒）
+            avg_session_duration = self._rng.uniform(60, 300, n).astype(np.int64)
+            
+            # 直帰率
+            bounce_rate = np.round(self._rng.uniform(30, 70, n), 2)
+            
+            # 日ごとのデータは列単位で保持し、結果の作成時にだけ辞書のリストに変換する
+            date_columns = {
+                'date': dates.astype(str),
+                'sessions': sessions,
+                'users': users,
+                'new_users': new_users,
+                'pageviews': pageviews,
+                'pages_per_session': pages_per_session,
+                'avg_session_duration': avg_session_duration,
+                'bounce_rate': bounce_rate
+            }
+            
+            # 総計を計算（合計と平均をそれぞれ1回の集計で求める）
+            total_sessions, total_users, total_new_users, total_pageviews = (
+                np.stack((sessions, users, new_users, pageviews)).sum(axis=1).tolist()
+            )
+            avg_pages_per_session = round(total_pageviews / total_sessions, 2)
+            avg_session_duration = int(avg_session_duration.mean())
+            avg_bounce_rate = round(float(bounce_rate.mean()), 2)
             
             # トラフィックソースのデータを生成
             traffic_sources = [
-                {'source': 'google', 'medium': 'organic', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.4, 0.6))},
-                {'source': 'direct', 'medium': 'none', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.15, 0.25))},
-                {'source': 'google', 'medium': 'cpc', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.05, 0.15))},
-                {'source': 'facebook', 'medium': 'social', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.05, 0.1))},
-                {'source': 'twitter', 'medium': 'social', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.02, 0.05))},
-                {'source': 'linkedin', 'medium': 'social', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.03))},
-                {'source': 'bing', 'medium': 'organic', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.02, 0.05))},
-                {'source': 'yahoo', 'medium': 'organic', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.03))},
-                {'source': 'referral', 'medium': 'referral', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.05, 0.1))},
-                {'source': 'email', 'medium': 'email', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.05))}
+                {'source': source, 'medium': medium, 'sessions': int(total_sessions * self._rng.uniform(low, high))}
+                for source, medium, low, high in _SOURCE_SPEC
             ]
             
             # 各ソースにユーザー数、コンバージョン率などを追加
-            for source in traffic_sources:
-                source['users'] = int(source['sessions'] * np.random.uniform(0.8, 0.95))
-                source['new_users'] = int(source['users'] * np.random.uniform(0.2, 0.4))
-                source['bounce_rate'] = round(np.random.uniform(30, 70), 2)
-                source['pages_per_session'] = round(np.random.uniform(1.5, 4.0), 2)
-                source['avg_session_duration'] = int(np.random.uniform(60, 300))
+            self._add_breakdown_metrics(traffic_sources)
             
             # デバイスカテゴリのデータを生成
             devices = [
-                {'device_category': 'mobile', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.5, 0.7))},
-                {'device_category': 'desktop', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.25, 0.45))},
-                {'device_category': 'tablet', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.05, 0.1))}
+                {'device_category': category, 'sessions': int(total_sessions * self._rng.uniform(low, high))}
+                for category, low, high in _DEVICE_SPEC
             ]
             
             # 各デバイスにユーザー数、コンバージョン率などを追加
-            for device in devices:
-                device['users'] = int(device['sessions'] * np.random.uniform(0.8, 0.95))
-                device['new_users'] = int(device['users'] * np.random.uniform(0.2, 0.4))
-                device['bounce_rate'] = round(np.random.uniform(30, 70), 2)
-                device['pages_per_session'] = round(np.random.uniform(1.5, 4.0), 2)
-                device['avg_session_duration'] = int(np.random.uniform(60, 300))
+            self._add_breakdown_metrics(devices)
             
             # 国別データを生成
             countries = [
-                {'country': 'Japan', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.6, 0.8))},
-                {'country': 'United States', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.05, 0.15))},
-                {'country': 'China', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.02, 0.05))},
-                {'country': 'South Korea', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.03))},
-                {'country': 'United Kingdom', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.03))},
-                {'country': 'Germany', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.005, 0.02))},
-                {'country': 'France', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.005, 0.02))},
-                {'country': 'Canada', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.005, 0.02))},
-                {'country': 'Australia', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.005, 0.02))},
-                {'country': 'Other', 'sessions': int(sum(item['sessions'] for item in date_data) * np.random.uniform(0.01, 0.05))}
+                {'country': country, 'sessions': int(total_sessions * self._rng.uniform(low, high))}
+                for country, low, high in _COUNTRY_SPEC
             ]
             
             # 各国にユーザー数などを追加
-            for country in countries:
-                country['users'] = int(country['sessions'] * np.random.uniform(0.8, 0.95))
-                country['new_users'] = int(country['users'] * np.random.uniform(0.2, 0.4))
-                country['bounce_rate'] = round(np.random.uniform(30, 70), 2)
-            
-            # 総計を計算
-            total_sessions = sum(item['sessions'] for item in date_data)
-            total_users = sum(item['users'] for item in date_data)
-            total_new_users = sum(item['new_users'] for item in date_data)
-            total_pageviews = sum(item['pageviews'] for item in date_data)
-            avg_pages_per_session = round(total_pageviews / total_sessions, 2)
-            avg_session_duration = int(sum(item['avg_session_duration'] for item in date_data) / len(date_data))
-            avg_bounce_rate = round(sum(item['bounce_rate'] for item in date_data) / len(date_data), 2)
+            self._add_breakdown_metrics(countries, session_metrics=False)
             
             # トレンドを計算
-            if len(date_data) > 1:
-                first_half = date_data[:len(date_data)//2]
-                second_half = date_data[len(date_data)//2:]
-                
-                first_half_sessions = sum(item['sessions'] for item in first_half)
-                second_half_sessions = sum(item['sessions'] for item in second_half)
-                sessions_trend = round((second_half_sessions - first_half_sessions) / first_half_sessions * 100, 1)
-                
-                first_half_users = sum(item['users'] for item in first_half)
-                second_half_users = sum(item['users'] for item in second_half)
-                users_trend = round((second_half_users - first_half_users) / first_half_users * 100, 1)
-                
-                first_half_pageviews = sum(item['pageviews'] for item in first_half)
-                second_half_pageviews = sum(item['pageviews'] for item in second_half)
-                pageviews_trend = round((second_half_pageviews - first_half_pageviews) / first_half_pageviews * 100, 1)
-            else:
-                sessions_trend = 0
-                users_trend = 0
-                pageviews_trend = 0
+            sessions_trend = _half_trend(sessions)
+            users_trend = _half_trend(users)
+            pageviews_trend = _half_trend(pageviews)
             
             # 結果の作成
             result = {
@@ -236,7 +381,10 @@ class AnalyticsAnalyzer:
                     'users': users_trend,
                     'pageviews': pageviews_trend
                 },
-                'date_data': date_data,
+                'date_data': [
+                    dict(zip(date_columns, row))
+                    for row in zip(*(column.tolist() for column in date_columns.values()))
+                ],
                 'traffic_sources': traffic_sources,
                 'devices': devices,
                 'countries': countries
@@ -247,8 +395,42 @@ class AnalyticsAnalyzer:
             # 実際のAPIを使用してデータを取得（実装が必要）
             # ここでは例としてモックデータを返す
             logger.warning("Google Analytics APIが実装されていません。モックデータを返します。")
+            # 以降はモックモードとして扱う（再帰呼び出しが終わらなくなるのを防ぐ）
+            self.mock_mode = True
             return self.get_traffic_data(days)
     
+    def _add_breakdown_metrics(self, rows, session_metrics=True):
+        """
+        セッション数の内訳データにユーザー数や直帰率などのモック値を追加
+        
+        各指標は行数分をまとめて生成します。
+        
+        Args:
+            rows (list): 'sessions' を持つ内訳データのリスト（直接更新される）
+            session_metrics (bool, optional): セッションあたりのページ数と平均セッション時間も追加するかどうか
+        """
+        n = len(rows)
+        sessions = np.fromiter((row['sessions'] for row in rows), dtype=np.int64, count=n)
+        users = (sessions * self._rng.uniform(0.8, 0.95, n)).astype(np.int64)
+        new_users = (users * self._rng.uniform(0.2, 0.4, n)).astype(np.int64)
+        bounce_rate = np.round(self._rng.uniform(30, 70, n), 2)
+        
+        for row, row_users, row_new_users, row_bounce_rate in zip(
+                rows, users.tolist(), new_users.tolist(), bounce_rate.tolist()):
+            row['users'] = row_users
+            row['new_users'] = row_new_users
+            row['bounce_rate'] = row_bounce_rate
+        
+        if session_metrics:
+            pages_per_session = np.round(self._rng.uniform(1.5, 4.0, n), 2)
+            avg_session_duration = self._rng.uniform(60, 300, n).astype(np.int64)
+            
+            for row, row_pages_per_session, row_avg_session_duration in zip(
+                    rows, pages_per_session.tolist(), avg_session_duration.tolist()):
+                row['pages_per_session'] = row_pages_per_session
+                row['avg_session_duration'] = row_avg_session_duration
+    
+    @_ttl_cached
     def get_page_data(self, limit=20):
         """
         ページごとのパフォーマンスデータを取得
@@ -264,57 +446,52 @@ class AnalyticsAnalyzer:
             logger.info("モックモードでページデータを生成します")
             
             # ページのモックデータ
-            mock_pages = [
-                self.url,
-                f"{self.url}about/",
-                f"{self.url}services/",
-                f"{self.url}contact/",
-                f"{self.url}blog/",
-                f"{self.url}blog/seo-tips/",
-                f"{self.url}blog/content-marketing/",
-                f"{self.url}blog/keyword-research/",
-                f"{self.url}products/",
-                f"{self.url}faq/"
-            ]
+            pages = [f"{self.url}{path}" for path in _MOCK_PAGE_PATHS[:limit]]
             
             # 追加のページを生成
-            for i in range(max(0, limit - len(mock_pages))):
-                mock_pages.append(f"{self.url}page-{i+1}/")
-            
-            # ページごとのデータを生成
-            page_data = []
-            
-            for page in mock_pages[:limit]:
-                # ページビュー数
-                pageviews = np.random.randint(50, 5000)
-                
-                # ユニークページビュー数
-                unique_pageviews = int(pageviews * np.random.uniform(0.7, 0.9))
-                
-                # 平均滞在時間（秒）
-                avg_time_on_page = int(np.random.uniform(30, 300))
-                
-                # 入口ページ数
-                entrances = int(unique_pageviews * np.random.uniform(0.1, 0.5))
-                
-                # 直帰率
-                bounce_rate = round(np.random.uniform(20, 80), 2)
-                
-                # 離脱率
-                exit_rate = round(np.random.uniform(10, 50), 2)
-                
-                page_data.append({
-                    'page_path': page,
-                    'pageviews': pageviews,
-                    'unique_pageviews': unique_pageviews,
-                    'avg_time_on_page': avg_time_on_page,
-                    'entrances': entrances,
-                    'bounce_rate': bounce_rate,
-                    'exit_rate': exit_rate
-                })
-            
-            # ページビュー数でソート
-            page_data.sort(key=lambda x: x['pageviews'], reverse=True)
+            pages.extend(f"{self.url}page-{i}/" for i in range(1, limit - len(_MOCK_PAGE_PATHS) + 1))
+            
+            # ページごとのデータを列単位でまとめて生成
+            n = len(pages)
+            rng = self._rng
+            
+            # ページビュー数
+            pageviews = rng.integers(50, 5000, n)
+            
+            # ユニークページビュー数
+            unique_pageviews = (pageviews * rng.uniform(0.7, 0.9, n)).astype(np.int64)
+            
+            # 平均滞在時間（秒）
+            avg_time_on_page = rng.uniform(30, 300, n).astype(np.int64)
+            
+            # 入口ページ数
+            entrances = (unique_pageviews * rng.uniform(0.1, 0.5, n)).astype(np.int64)
+            
+            # 直帰率
+            bounce_rate = np.round(rng.uniform(20, 80, n), 2)
+            
+            # 離脱率
+            exit_rate = np.round(rng.uniform(10, 50, n), 2)
+            
+            # ページビュー数でソート（同数の場合は元の順序を保つ）
+            order = np.argsort(-pageviews, kind='stable')
+            page_data = [
+                {
+                    'page_path': pages[i],
+                    'pageviews': page_pageviews,
+                    'unique_pageviews': page_unique_pageviews,
+                    'avg_time_on_page': page_avg_time_on_page,
+                    'entrances': page_entrances,
+                    'bounce_rate': page_bounce_rate,
+                    'exit_rate': page_exit_rate
+                }
+                for i, page_pageviews, page_unique_pageviews, page_avg_time_on_page, page_entrances,
+                    page_bounce_rate, page_exit_rate in zip(
+                    order.tolist(), pageviews[order].tolist(), unique_pageviews[order].tolist(),
+                    avg_time_on_page[order].tolist(), entrances[order].tolist(),
+                    bounce_rate[order].tolist(), exit_rate[order].tolist()
+                )
+            ]
             
             # 結果の作成
             result = {
@@ -327,8 +504,11 @@ class AnalyticsAnalyzer:
             # 実際のAPIを使用してデータを取得（実装が必要）
             # ここでは例としてモックデータを返す
             logger.warning("Google Analytics APIが実装されていません。モックデータを返します。")
+            # 以降はモックモードとして扱う（再帰呼び出しが終わらなくなるのを防ぐ）
+            self.mock_mode = True
             return self.get_page_data(limit)
     
+    @_ttl_cached
     def get_event_data(self, limit=10):
         """
         イベントデータを取得
@@ -343,55 +523,51 @@ class AnalyticsAnalyzer:
             # モックデータを返す
             logger.info("モックモードでイベントデータを生成します")
             
-            # イベントカテゴリのモックデータ
-            event_categories = ['engagement', 'outbound', 'download', 'video', 'form', 'scroll', 'click']
-            
-            # イベントアクションのモックデータ
-            event_actions = {
-                'engagement': ['read', 'share', 'comment', 'like'],
-                'outbound': ['click', 'navigate'],
-                'download': ['pdf', 'doc', 'zip', 'image'],
-                'video': ['play', 'pause', 'complete', '25%', '50%', '75%'],
-                'form': ['start', 'submit', 'error', 'complete'],
-                'scroll': ['25%', '50%', '75%', '100%'],
-                'click': ['button', 'link', 'image', 'menu']
-            }
+            # イベントごとのデータを列単位でまとめて生成
+            n = len(_EVENT_PAIRS)
+            rng = self._rng
+            
+            # イベント数
+            total_events = rng.integers(50, 1000, n)
+            
+            # ユニークイベント数
+            unique_events = (total_events * rng.uniform(0.7, 0.9, n)).astype(np.int64)
+            
+            # イベントあたりの値（値を持つカテゴリのみ）
+            value_per_event = np.zeros(n)
+            value_per_event[_EVENT_VALUED_MASK] = np.round(rng.uniform(0.1, 5.0, int(_EVENT_VALUED_MASK.sum())), 2)
             
-            # イベントデータを生成
-            event_data = []
-            
-            for category in event_categories:
-                for action in event_actions.get(category, [])[:2]:  # 各カテゴリから最大2つのアクションを使用
-                    # イベント数
-                    total_events = np.random.randint(50, 1000)
-                    
-                    # ユニークイベント数
-                    unique_events = int(total_events * np.random.uniform(0.7, 0.9))
-                    
-                    # イベントあたりの値
-                    value_per_event = round(np.random.uniform(0.1, 5.0), 2) if category in ['engagement', 'download', 'form'] else 0
-                    
-                    # 総価値
-                    total_value = int(total_events * value_per_event) if value_per_event > 0 else 0
-                    
-                    event_data.append({
-                        'event_category': category,
-                        'event_action': action,
-                        'total_events': total_events,
-                        'unique_events': unique_events,
-                        'value_per_event': value_per_event,
-                        'total_value': total_value
-                    })
-            
-            # イベント数でソート
-            event_data.sort(key=lambda x: x['total_events'], reverse=True)
+            # 総価値
+            total_value = (total_events * value_per_event).astype(np.int64)
+            
+            # 総計を計算（3つの列を1回の集計で求める）
+            sum_total_events, sum_unique_events, sum_total_value = (
+                np.stack((total_events, unique_events, total_value)).sum(axis=1).tolist()
+            )
+            
+            # イベント数でソートし、上限までの行だけを辞書に変換（同数の場合は元の順序を保つ）
+            order = np.argsort(-total_events, kind='stable')[:limit]
+            event_data = [
+                {
+                    'event_category': _EVENT_PAIRS[i][0],
+                    'event_action': _EVENT_PAIRS[i][1],
+                    'total_events': event_total_events,
+                    'unique_events': event_unique_events,
+                    'value_per_event': event_value_per_event if _EVENT_VALUED_MASK[i] else 0,
+                    'total_value': event_total_value
+                }
+                for i, event_total_events, event_unique_events, event_value_per_event, event_total_value in zip(
+                    order.tolist(), total_events[order].tolist(), unique_events[order].tolist(),
+                    value_per_event[order].tolist(), total_value[order].tolist()
+                )
+            ]
             
             # 結果の作成
             result = {
-                'total_events': sum(item['total_events'] for item in event_data),
-                'unique_events': sum(item['unique_events'] for item in event_data),
-                'total_value': sum(item['total_value'] for item in event_data),
-                'event_data': event_data[:limit]
+                'total_events': sum_total_events,
+                'unique_events': sum_unique_events,
+                'total_value': sum_total_value,
+                'event_data': event_data
             }
             
             return result
@@ -399,6 +575,8 @@ class AnalyticsAnalyzer:
             # 実際のAPIを使用してデータを取得（実装が必要）
             # ここでは例としてモックデータを返す
             logger.warning("Google Analytics APIが実装されていません。モックデータを返します。")
+            # 以降はモックモードとして扱う（再帰呼び出しが終わらなくなるのを防ぐ）
+            self.mock_mode = True
             return self.get_event_data(limit)
     
     def analyze(self):
@@ -413,14 +591,14 @@ class AnalyticsAnalyzer:
         # 分析開始時刻
         start_time = time.time()
         
-        # トラフィックデータの取得
-        traffic_data = self.get_traffic_data(days=30)
-        
-        # ページデータの取得
-        page_data = self.get_page_data(limit=20)
-        
-        # イベントデータの取得
-        event_data = self.get_event_data(limit=10)
+        # トラフィック・ページ・イベントデータを並行して取得
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            traffic_future = executor.submit(self.get_traffic_data, days=30)
+            page_future = executor.submit(self.get_page_data, limit=20)
+            event_future = executor.submit(self.get_event_data, limit=10)
+            traffic_data = traffic_future.result()
+            page_data = page_future.result()
+            event_data = event_future.result()
         
         # 上位ページの抽出
         top_pages = page_data['page_data'][:10]
@@ -430,58 +608,25 @@ class AnalyticsAnalyzer:
         
         # デバイスデータの抽出
         device_data = traffic_data['devices']
+        device_by_category = {device['device_category']: device for device in device_data}
         
         # 国別データの抽出
         country_data = traffic_data['countries'][:5]
         
+        totals = traffic_data['totals']
+        
         # トラフィックの評価
-        if traffic_data['totals']['sessions'] > 10000:
-            traffic_rating = '非常に良好'
-        elif traffic_data['totals']['sessions'] > 5000:
-            traffic_rating = '良好'
-        elif traffic_data['totals']['sessions'] > 1000:
-            traffic_rating = '普通'
-        else:
-            traffic_rating = '改善の余地あり'
-        
-        # エンゲージメントの評価
-        engagement_score = 0
-        
-        # 直帰率に基づくスコア（低いほど良い）
-        if traffic_data['totals']['bounce_rate'] < 30:
-            engagement_score += 30
-        elif traffic_data['totals']['bounce_rate'] < 50:
-            engagement_score += 20
-        elif traffic_data['totals']['bounce_rate'] < 70:
-            engagement_score += 10
-        
-        # ページ/セッションに基づくスコア（高いほど良い）
-        if traffic_data['totals']['pages_per_session'] > 3:
-            engagement_score += 30
-        elif traffic_data['totals']['pages_per_session'] > 2:
-            engagement_score += 20
-        elif traffic_data['totals']['pages_per_session'] > 1.5:
-            engagement_score += 10
-        
-        # セッション時間に基づくスコア（長いほど良い）
-        if traffic_data['totals']['avg_session_duration'] > 180:
-            engagement_score += 40
-        elif traffic_data['totals']['avg_session_duration'] > 120:
-            engagement_score += 30
-        elif traffic_data['totals']['avg_session_duration'] > 60:
-            engagement_score += 20
-        else:
-            engagement_score += 10
+        traffic_rating = _RATINGS[bisect.bisect_left(_TRAFFIC_THRESHOLDS, totals['sessions'])]
+        
+        # エンゲージメントの評価（直帰率・ページ/セッション・セッション時間のスコアの合計）
+        engagement_score = (
+            _BOUNCE_SCORES[bisect.bisect_right(_BOUNCE_THRESHOLDS, totals['bounce_rate'])]
+            + _PAGES_PER_SESSION_SCORES[bisect.bisect_left(_PAGES_PER_SESSION_THRESHOLDS, totals['pages_per_session'])]
+            + _DURATION_SCORES[bisect.bisect_left(_DURATION_THRESHOLDS, totals['avg_session_duration'])]
+        )
         
         # エンゲージメント評価
-        if engagement_score > 80:
-            engagement_rating = '非常に良好'
-        elif engagement_score > 60:
-            engagement_rating = '良好'
-        elif engagement_score > 40:
-            engagement_rating = '普通'
-        else:
-            engagement_rating = '改善の余地あり'
+        engagement_rating = _RATINGS[bisect.bisect_left(_ENGAGEMENT_THRESHOLDS, engagement_score)]
         
         # 改善提案の作成
         recommendations = []
@@ -490,19 +635,21 @@ class AnalyticsAnalyzer:
         if traffic_data['trends']['sessions'] < 0:
             recommendations.append('トラフィックが減少傾向にあります。SEO対策やコンテンツマーケティングを強化してください')
         
-        # トラフィックソースに基づく提案
-        organic_sources = [source for source in traffic_data['traffic_sources'] if source['medium'] == 'organic']
-        organic_sessions = sum(source['sessions'] for source in organic_sources)
+        # トラフィックソースに基づく提案（メディア別セッション数を1パスで集計）
+        medium_sessions = {}
+        for source in traffic_data['traffic_sources']:
+            medium_sessions[source['medium']] = medium_sessions.get(source['medium'], 0) + source['sessions']
+        
+        organic_sessions = medium_sessions.get('organic', 0)
         if organic_sessions / traffic_data['totals']['sessions'] < 0.3:
             recommendations.append('オーガニック検索からのトラフィックが少ないです。SEO対策を強化してください')
         
-        social_sources = [source for source in traffic_data['traffic_sources'] if source['medium'] == 'social']
-        social_sessions = sum(source['sessions'] for source in social_sources)
+        social_sessions = medium_sessions.get('social', 0)
         if social_sessions / traffic_data['totals']['sessions'] < 0.1:
             recommendations.append('ソーシャルメディアからのトラフィックが少ないです。ソーシャルメディアマーケティングを強化してください')
         
         # デバイスに基づく提案
-        mobile_device = next((device for device in device_data if device['device_category'] == 'mobile'), None)
+        mobile_device = device_by_category.get('mobile')
         if mobile_device and mobile_device['bounce_rate'] > 60:
             recommendations.append('モバイルユーザーの直帰率が高いです。モバイルユーザビリティを改善してください')
         
@@ -553,3 +700,12 @@ class AnalyticsAnalyzer:
         logger.info(f"Google Analytics分析が完了しました: {self.url}")
         
         return result
+    
+    def to_json(self):
+        """
+        Google Analytics分析結果をJSON文字列で取得
+        
+        Returns:
+            str: 分析結果のJSON文字列
+        """
+        return _dumps(self.analyze())
@@ -1,13 +1,296 @@
 """
 SEOマスターパッケージのGoogle API連携モジュール
 """
+import functools
+import heapq
 import os
 import json
+import re
+import threading
+import types
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import httplib2
+import numpy as np
 import requests
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:  # orjson が無い環境では標準のjsonで出力する
+    orjson = None
+
+# APIレスポンスを再利用する期間（秒）。Search Console・Analyticsのデータは日単位で集計されるため、数時間程度は再利用できる
+_RESPONSE_CACHE_TTL = 3600
+_RESPONSE_CACHE_SIZE = 128
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Google APIへのリクエストのタイムアウト（秒）
+_HTTP_TIMEOUT = 30
+_http_local = threading.local()
+
+def _shared_http(api_name):
+    """
+    同じスレッドで作成した同じAPIのクライアント間で共有するhttplib2.Httpを返します。
+    
+    接続を使い回してTLSハンドシェイクを省きます。httplib2.Httpはスレッドセーフではないため、
+    スレッドをまたいでは共有しません。
+    
+    Args:
+        api_name (str): API名
+        
+    Returns:
+        httplib2.Http: 共有するHTTPクライアント
+    """
+    pool = getattr(_http_local, 'pool', None)
+    if pool is None:
+        pool = _http_local.pool = {}
+    http = pool.get(api_name)
+    if http is None:
+        http = pool[api_name] = httplib2.Http(timeout=_HTTP_TIMEOUT)
+    return http
+
+class _OrjsonModel(JsonModel):
+    """APIレスポンスのJSONをorjsonで読み込むモデル（大きなレスポンスの読み込みを高速化）"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # JSONでないレスポンスは標準の処理に任せる
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+def _api_model():
+    """
+    APIサービスで使うレスポンスのモデルを返します。
+    
+    Returns:
+        JsonModel: orjsonがあれば_OrjsonModel、無ければNone（標準のJsonModelを使用）
+    """
+    if orjson is None:
+        return None
+    return _OrjsonModel()
+
+def _dumps_indented(value, level):
+    """
+    値をインデント付きのJSONバイト列に変換します（orjsonがあればそちらを使用）。
+    
+    Args:
+        value: 変換する値
+        level (int): 出力先での入れ子の深さ（2行目以降をこの深さ分インデントする）
+        
+    Returns:
+        bytes: JSONバイト列
+    """
+    if orjson is not None:
+        text = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    else:
+        text = json.dumps(value, ensure_ascii=False, indent=2).encode('utf-8')
+    return text.replace(b'\n', b'\n' + b'  ' * level)
+
+def _write_json_report(filepath, data):
+    """
+    レポートをJSONファイルとして保存します。
+    
+    値がジェネレータの項目は要素を1件ずつ書き出すため、日次データなどをすべてメモリ上の
+    リストにしなくても保存できます。出力はjson.dump(indent=2)と同じ形式です。
+    
+    Args:
+        filepath (str): 保存先のファイルパス
+        data (dict): レポートの内容
+    """
+    with open(filepath, 'wb') as f:
+        if not data:
+            f.write(b'{}')
+            return
+        
+        f.write(b'{')
+        for i, (key, value) in enumerate(data.items()):
+            f.write(b',\n  ' if i else b'\n  ')
+            f.write(_dumps_indented(key, 1))
+            f.write(b': ')
+            
+            if not isinstance(value, types.GeneratorType):
+                f.write(_dumps_indented(value, 1))
+                continue
+            
+            # ジェネレータは配列として1件ずつ書き出す
+            f.write(b'[')
+            empty = True
+            for item in value:
+                f.write(b'\n    ' if empty else b',\n    ')
+                f.write(_dumps_indented(item, 2))
+                empty = False
+            f.write(b']' if empty else b'\n  ]')
+        f.write(b'\n}')
+
+def _response_cache_key(api_name, resource, body):
+    """
+    APIレスポンスのキャッシュキーを作成します。
+    
+    Args:
+        api_name (str): API名
+        resource (str): サイトURLやプロパティIDなどの対象
+        body (dict): リクエストボディ（日付範囲を含む）
+        
+    Returns:
+        tuple: キャッシュキー
+    """
+    return (api_name, resource, json.dumps(body, sort_keys=True))
+
+def _get_cached_response(key):
+    """
+    有効期限内のキャッシュ済みレスポンスを返します。
+    
+    Args:
+        key (tuple): キャッシュキー
+        
+    Returns:
+        dict: キャッシュ済みレスポンス（無い場合・期限切れの場合はNone）
+    """
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= _RESPONSE_CACHE_TTL:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry[1]
+
+def _set_cached_response(key, response):
+    """
+    レスポンスをキャッシュに保存します。上限を超えた場合は最も古いものから削除します。
+    
+    Args:
+        key (tuple): キャッシュキー
+        response (dict): APIレスポンス
+    """
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), response)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+def _row_clicks(row):
+    """検索アナリティクスの行のクリック数を返します（上位の抽出に使用）。"""
+    return row.get('clicks', 0)
+
+@functools.lru_cache(maxsize=8)
+def _load_credentials(credentials_path, mtime, scopes):
+    """
+    サービスアカウントの認証情報を読み込みます。
+    
+    同じファイル・スコープの認証情報は一度だけ読み込み、全クライアントで共有します
+    （ファイルが更新された場合は更新日時が変わるため読み込み直します）。
+    
+    Args:
+        credentials_path (str): 認証ファイルのパス
+        mtime (float): 認証ファイルの更新日時
+        scopes (tuple): スコープ
+        
+    Returns:
+        Credentials: 認証情報
+    """
+    return Credentials.from_service_account_file(credentials_path, scopes=list(scopes))
+
+# レポートのファイル名を作るための変換（URLのスキームを除き、スラッシュをアンダースコアにする）
+_URL_SCHEME_RE = re.compile(r'https?://')
+_SLASH_TO_UNDERSCORE = str.maketrans('/', '_')
+
+# Search Consoleの検索アナリティクスで1リクエストに取得できる最大行数
+_SEARCH_ANALYTICS_MAX_ROWS = 25000
+
+# Search Consoleのモックデータ（クエリ別）
+_MOCK_QUERY_ROWS = (
+    {'keys': ['seo分析'], 'clicks': 120, 'impressions': 1500, 'ctr': 0.08, 'position': 3.2},
+    {'keys': ['seoツール'], 'clicks': 95, 'impressions': 1200, 'ctr': 0.079, 'position': 4.1},
+    {'keys': ['無料seo診断'], 'clicks': 85, 'impressions': 950, 'ctr': 0.089, 'position': 2.8},
+    {'keys': ['seo対策 方法'], 'clicks': 75, 'impressions': 850, 'ctr': 0.088, 'position': 5.3},
+    {'keys': ['サイト分析 ツール'], 'clicks': 65, 'impressions': 750, 'ctr': 0.087, 'position': 6.2}
+)
+
+# Search Consoleのモックデータ（ページ別）
+_MOCK_PAGE_ROWS = (
+    {'keys': ['/'], 'clicks': 250, 'impressions': 3000, 'ctr': 0.083, 'position': 2.5},
+    {'keys': ['/services'], 'clicks': 180, 'impressions': 2200, 'ctr': 0.082, 'position': 3.1},
+    {'keys': ['/blog/seo-tips'], 'clicks': 150, 'impressions': 1800, 'ctr': 0.083, 'position': 2.8},
+    {'keys': ['/contact'], 'clicks': 120, 'impressions': 1500, 'ctr': 0.08, 'position': 3.5},
+    {'keys': ['/about'], 'clicks': 100, 'impressions': 1200, 'ctr': 0.083, 'position': 4.2}
+)
+
+# モックデータ生成用の乱数生成器
+_MOCK_RNG = np.random.default_rng()
+
+@functools.lru_cache(maxsize=8)
+def _build_mock_traffic_data(end_date, days):
+    """
+    モックのトラフィックデータを生成します。
+    
+    Args:
+        end_date (date): 最終日
+        days (int): 日数
+        
+    Returns:
+        dict: モックのトラフィックデータ
+    """
+    # 最終日から遡る日付をまとめてYYYYMMDD形式に変換
+    date_strs = [
+        iso_date.replace('-', '')
+        for iso_date in (np.datetime64(end_date, 'D') - np.arange(days)).astype(str).tolist()
+    ]
+    
+    # 日ごとの指標を配列でまとめて生成（基本値に若干のランダム性を持たせる）
+    base_sessions = 100 + (days - np.arange(days)) * 2  # 日付が近いほど多い傾向
+    variation = _MOCK_RNG.uniform(0.8, 1.2, days)
+    
+    sessions = (base_sessions * variation).astype(np.int64)
+    active_users = (sessions * 0.9).astype(np.int64)
+    new_users = (sessions * 0.3).astype(np.int64)
+    engagement_rates = _MOCK_RNG.uniform(0.4, 0.7, days)
+    avg_session_durations = _MOCK_RNG.uniform(120, 300, days).astype(np.int64)
+    
+    rows = [
+        {
+            'dimensionValues': [{'value': date_str}],
+            'metricValues': [
+                {'value': str(day_sessions)},
+                {'value': str(day_active_users)},
+                {'value': str(day_new_users)},
+                {'value': str(round(engagement_rate, 2))},
+                {'value': str(avg_session_duration)}
+            ]
+        }
+        for date_str, day_sessions, day_active_users, day_new_users, engagement_rate, avg_session_duration in zip(
+            date_strs, sessions.tolist(), active_users.tolist(), new_users.tolist(),
+            engagement_rates.tolist(), avg_session_durations.tolist()
+        )
+    ]
+    
+    # レスポンス形式に整形
+    mock_data = {
+        'dimensionHeaders': [{'name': 'date'}],
+        'metricHeaders': [
+            {'name': 'sessions', 'type': 'INTEGER'},
+            {'name': 'activeUsers', 'type': 'INTEGER'},
+            {'name': 'newUsers', 'type': 'INTEGER'},
+            {'name': 'engagementRate', 'type': 'FLOAT'},
+            {'name': 'averageSessionDuration', 'type': 'INTEGER'}
+        ],
+        'rows': rows
+    }
+    
+    return mock_data
 
 class GoogleSearchConsoleAPI:
     """
@@ -47,22 +330,25 @@ class GoogleSearchConsoleAPI:
         if not credentials_path or not os.path.exists(credentials_path):
             raise FileNotFoundError("Google API認証ファイルが見つかりません。")
         
-        # 認証情報を読み込む
-        credentials = Credentials.from_service_account_file(
+        # 認証情報を読み込む（同じ認証ファイルは再度読み込まない）
+        credentials = _load_credentials(
             credentials_path,
-            scopes=['https://www.googleapis.com/auth/webmasters.readonly']
+            os.path.getmtime(credentials_path),
+            ('https://www.googleapis.com/auth/webmasters.readonly',)
         )
         
-        # APIサービスを構築
-        self.service = build('searchconsole', 'v1', credentials=credentials)
+        # APIサービスを構築（ディスカバリドキュメントは同梱のものを使い、接続は同じスレッドのクライアント間で使い回す）
+        authed_http = AuthorizedHttp(credentials, http=_shared_http('searchconsole'))
+        self.service = build('searchconsole', 'v1', http=authed_http, static_discovery=True, model=_api_model())
     
-    def get_search_analytics(self, days=30, dimensions=None):
+    def get_search_analytics(self, days=30, dimensions=None, row_limit=1000):
         """
         Search Consoleから検索アナリティクスデータを取得します。
         
         Args:
             days (int): 取得する日数（デフォルト: 30日）
             dimensions (list): データのディメンション（デフォルト: ['query']）
+            row_limit (int): 取得する最大行数（デフォルト: 1000）
             
         Returns:
             dict: 検索アナリティクスデータ
@@ -70,26 +356,142 @@ class GoogleSearchConsoleAPI:
         if dimensions is None:
             dimensions = ['query']
         
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
-        
         if self.mock_mode:
             return self._get_mock_search_analytics(dimensions)
         
+        # 1リクエストで取得できる行数を超える場合は、ページごとのリクエストをまとめてバッチで取得
+        if row_limit > _SEARCH_ANALYTICS_MAX_ROWS:
+            return self.get_search_analytics_batch(days, [dimensions], [row_limit])[0]
+        
+        # 1日以内のデータは更新途中のためキャッシュしない
+        cacheable = days > 1
+        request = self._build_search_analytics_request(days, dimensions, row_limit)
+        cache_key = _response_cache_key('searchconsole', self.site_url, request)
+        if cacheable:
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            request = {
-                'startDate': start_date.strftime('%Y-%m-%d'),
-                'endDate': end_date.strftime('%Y-%m-%d'),
-                'dimensions': dimensions,
-                'rowLimit': 1000
-            }
-            
             response = self.service.searchanalytics().query(siteUrl=self.site_url, body=request).execute()
+            if cacheable:
+                _set_cached_response(cache_key, response)
             return response
         except HttpError as e:
             print(f"Google Search Console APIリクエストエラー: {e}")
             return self._get_mock_search_analytics(dimensions)
     
+    def _build_search_analytics_request(self, days, dimensions, row_limit=1000, start_row=0):
+        """
+        検索アナリティクスのリクエストボディを作成します。
+        
+        Args:
+            days (int): 取得する日数
+            dimensions (list): データのディメンション
+            row_limit (int): 取得する行数
+            start_row (int): 取得を開始する行（0始まり）
+            
+        Returns:
+            dict: リクエストボディ
+        """
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days)
+        
+        request = {
+            'startDate': start_date.strftime('%Y-%m-%d'),
+            'endDate': end_date.strftime('%Y-%m-%d'),
+            'dimensions': dimensions,
+            'rowLimit': row_limit
+        }
+        if start_row:
+            request['startRow'] = start_row
+        
+        return request
+    
+    def get_search_analytics_batch(self, days=30, dimensions_list=None, row_limits=None):
+        """
+        複数のディメンションの検索アナリティクスデータを1回のバッチリクエストで取得します。
+        
+        1リクエストで取得できる行数を超える場合は、startRowでページに分けたリクエストも同じバッチに含めます。
+        
+        Args:
+            days (int): 取得する日数（デフォルト: 30日）
+            dimensions_list (list): ディメンションのリストのリスト（デフォルト: [['query'], ['page']]）
+            row_limits (list): ディメンションごとの取得する最大行数（デフォルト: すべて1000）
+            
+        Returns:
+            list: dimensions_listと同じ順序の検索アナリティクスデータ
+        """
+        if dimensions_list is None:
+            dimensions_list = [['query'], ['page']]
+        
+        if row_limits is None:
+            row_limits = [1000] * len(dimensions_list)
+        
+        if self.mock_mode:
+            return [self._get_mock_search_analytics(dimensions) for dimensions in dimensions_list]
+        
+        # ディメンションごとのページのリクエストID（"ディメンションの番号-開始行"）
+        page_ids = [
+            [f"{i}-{start_row}" for start_row in range(0, max(row_limit, 1), _SEARCH_ANALYTICS_MAX_ROWS)]
+            for i, row_limit in enumerate(row_limits)
+        ]
+        
+        # 1日以内のデータは更新途中のためキャッシュしない
+        cacheable = days > 1
+        responses = {}
+        cache_keys = {}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"Google Search Console APIリクエストエラー: {exception}")
+                return
+            responses[request_id] = response
+            if cacheable:
+                _set_cached_response(cache_keys[request_id], response)
+        
+        try:
+            batch = self.service.new_batch_http_request(callback=callback)
+            pending = 0
+            for dimensions, row_limit, ids in zip(dimensions_list, row_limits, page_ids):
+                for request_id in ids:
+                    start_row = int(request_id.split('-')[1])
+                    request = self._build_search_analytics_request(
+                        days, dimensions, min(row_limit - start_row, _SEARCH_ANALYTICS_MAX_ROWS), start_row
+                    )
+                    cache_keys[request_id] = _response_cache_key('searchconsole', self.site_url, request)
+                    
+                    # キャッシュ済みのものはバッチに含めない
+                    cached = _get_cached_response(cache_keys[request_id]) if cacheable else None
+                    if cached is not None:
+                        responses[request_id] = cached
+                        continue
+                    
+                    batch.add(
+                        self.service.searchanalytics().query(siteUrl=self.site_url, body=request),
+                        request_id=request_id
+                    )
+                    pending += 1
+            if pending:
+                batch.execute()
+        except HttpError as e:
+            print(f"Google Search Console APIリクエストエラー: {e}")
+        
+        results = []
+        for dimensions, ids in zip(dimensions_list, page_ids):
+            # 失敗したリクエストがあればモックデータで補う
+            if any(request_id not in responses for request_id in ids):
+                results.append(self._get_mock_search_analytics(dimensions))
+                continue
+            
+            response = responses[ids[0]]
+            if len(ids) > 1:
+                # ページごとの行を開始行の順に連結
+                response = dict(response, rows=[row for request_id in ids for row in responses[request_id].get('rows', [])])
+            results.append(response)
+        
+        return results
+    
     def _get_mock_search_analytics(self, dimensions):
         """
         モックの検索アナリティクスデータを生成します。
@@ -100,29 +502,12 @@ class GoogleSearchConsoleAPI:
         Returns:
             dict: モックの検索アナリティクスデータ
         """
-        mock_data = {
-            'rows': []
-        }
-        
-        # ディメンションに応じてモックデータを生成
+        # ディメンションに応じてモックデータを返す
         if 'query' in dimensions:
-            mock_data['rows'] = [
-                {'keys': ['seo分析'], 'clicks': 120, 'impressions': 1500, 'ctr': 0.08, 'position': 3.2},
-                {'keys': ['seoツール'], 'clicks': 95, 'impressions': 1200, 'ctr': 0.079, 'position': 4.1},
-                {'keys': ['無料seo診断'], 'clicks': 85, 'impressions': 950, 'ctr': 0.089, 'position': 2.8},
-                {'keys': ['seo対策 方法'], 'clicks': 75, 'impressions': 850, 'ctr': 0.088, 'position': 5.3},
-                {'keys': ['サイト分析 ツール'], 'clicks': 65, 'impressions': 750, 'ctr': 0.087, 'position': 6.2}
-            ]
-        elif 'page' in dimensions:
-            mock_data['rows'] = [
-                {'keys': ['/'], 'clicks': 250, 'impressions': 3000, 'ctr': 0.083, 'position': 2.5},
-                {'keys': ['/services'], 'clicks': 180, 'impressions': 2200, 'ctr': 0.082, 'position': 3.1},
-                {'keys': ['/blog/seo-tips'], 'clicks': 150, 'impressions': 1800, 'ctr': 0.083, 'position': 2.8},
-                {'keys': ['/contact'], 'clicks': 120, 'impressions': 1500, 'ctr': 0.08, 'position': 3.5},
-                {'keys': ['/about'], 'clicks': 100, 'impressions': 1200, 'ctr': 0.083, 'position': 4.2}
-            ]
-        
-        return mock_data
+            return {'rows': list(_MOCK_QUERY_ROWS)}
+        if 'page' in dimensions:
+            return {'rows': list(_MOCK_PAGE_ROWS)}
+        return {'rows': []}
     
     def analyze_search_performance(self, days=30):
         """
@@ -134,11 +519,9 @@ class GoogleSearchConsoleAPI:
         Returns:
             dict: 分析結果
         """
-        # クエリデータを取得
-        query_data = self.get_search_analytics(days, ['query'])
-        
-        # ページデータを取得
-        page_data = self.get_search_analytics(days, ['page'])
+        # クエリデータとページデータを1回のバッチリクエストで取得
+        # （クエリデータはサマリーの集計にも使うため1000行、ページデータは上位10件のみ使うため10行）
+        query_data, page_data = self.get_search_analytics_batch(days, [['query'], ['page']], [1000, 10])
         
         # 分析結果を生成
         results = {
@@ -155,8 +538,9 @@ class GoogleSearchConsoleAPI:
         
         # クエリデータを処理
         if 'rows' in query_data:
-            total_clicks = sum(row.get('clicks', 0) for row in query_data['rows'])
-            total_impressions = sum(row.get('impressions', 0) for row in query_data['rows'])
+            rows = query_data['rows']
+            total_clicks = int(np.fromiter((row.get('clicks', 0) for row in rows), dtype=np.int64, count=len(rows)).sum())
+            total_impressions = int(np.fromiter((row.get('impressions', 0) for row in rows), dtype=np.int64, count=len(rows)).sum())
             
             # CTRと平均順位を計算
             if total_impressions > 0:
@@ -164,8 +548,8 @@ class GoogleSearchConsoleAPI:
             else:
                 average_ctr = 0
                 
-            if query_data['rows']:
-                average_position = sum(row.get('position', 0) for row in query_data['rows']) / len(query_data['rows'])
+            if rows:
+                average_position = float(np.fromiter((row.get('position', 0) for row in rows), dtype=np.float64, count=len(rows)).mean())
             else:
                 average_position = 0
             
@@ -186,7 +570,7 @@ class GoogleSearchConsoleAPI:
                     'ctr': round(row.get('ctr', 0) * 100, 2),
                     'position': round(row.get('position', 0), 1)
                 }
-                for row in query_data['rows'][:10]  # 上位10件を取得
+                for row in heapq.nlargest(10, query_data['rows'], key=_row_clicks)  # クリック数の上位10件を取得
             ]
         
         # ページデータを処理
@@ -200,7 +584,7 @@ class GoogleSearchConsoleAPI:
                     'ctr': round(row.get('ctr', 0) * 100, 2),
                     'position': round(row.get('position', 0), 1)
                 }
-                for row in page_data['rows'][:10]  # 上位10件を取得
+                for row in heapq.nlargest(10, page_data['rows'], key=_row_clicks)  # クリック数の上位10件を取得
             ]
         
         return results
@@ -227,14 +611,13 @@ class GoogleSearchConsoleAPI:
         os.makedirs(output_dir, exist_ok=True)
         
         # ファイル名を生成
-        domain = self.site_url.replace('https://', '').replace('http://', '').replace('/', '_')
+        domain = _URL_SCHEME_RE.sub('', self.site_url).translate(_SLASH_TO_UNDERSCORE)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"search_console_report_{domain}_{timestamp}.json"
         filepath = os.path.join(output_dir, filename)
         
         # レポートをJSONファイルとして保存
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, ensure_ascii=False, indent=2)
+        _write_json_report(filepath, analysis_results)
         
         return filepath
 
@@ -277,14 +660,16 @@ class GoogleAnalyticsAPI:
         if not credentials_path or not os.path.exists(credentials_path):
             raise FileNotFoundError("Google API認証ファイルが見つかりません。")
         
-        # 認証情報を読み込む
-        credentials = Credentials.from_service_account_file(
+        # 認証情報を読み込む（同じ認証ファイルは再度読み込まない）
+        credentials = _load_credentials(
             credentials_path,
-            scopes=['https://www.googleapis.com/auth/analytics.readonly']
+            os.path.getmtime(credentials_path),
+            ('https://www.googleapis.com/auth/analytics.readonly',)
         )
         
-        # APIサービスを構築
-        self.service = build('analyticsdata', 'v1beta', credentials=credentials)
+        # APIサービスを構築（ディスカバリドキュメントは同梱のものを使い、接続は同じスレッドのクライアント間で使い回す）
+        authed_http = AuthorizedHttp(credentials, http=_shared_http('analyticsdata'))
+        self.service = build('analyticsdata', 'v1beta', http=authed_http, static_discovery=True, model=_api_model())
     
     def get_traffic_data(self, days=30):
         """
@@ -323,11 +708,22 @@ class GoogleAnalyticsAPI:
                 ]
             }
             
+            # 1日以内のデータは更新途中のためキャッシュしない
+            cacheable = days > 1
+            cache_key = _response_cache_key('analyticsdata', self.property_id, request)
+            if cacheable:
+                cached = _get_cached_response(cache_key)
+                if cached is not None:
+                    return cached
+            
             response = self.service.properties().runReport(
                 property=f"properties/{self.property_id}",
                 body=request
             ).execute()
             
+            if cacheable:
+                _set_cached_response(cache_key, response)
+            
             return response
         except Exception as e:
             print(f"Google Analytics APIリクエストエラー: {e}")
@@ -343,57 +739,16 @@ class GoogleAnalyticsAPI:
         Returns:
             dict: モックのトラフィックデータ
         """
-        end_date = datetime.now().date()
-        rows = []
-        
-        # 日付ごとのデータを生成
-        for i in range(days):
-            date = end_date - timedelta(days=i)
-            date_str = date.strftime('%Y%m%d')
-            
-            # 基本値に若干のランダム性を持たせる
-            import random
-            base_sessions = 100 + (days - i) * 2  # 日付が近いほど多い傾向
-            variation = random.uniform(0.8, 1.2)
-            
-            sessions = int(base_sessions * variation)
-            active_users = int(sessions * 0.9)
-            new_users = int(sessions * 0.3)
-            engagement_rate = round(random.uniform(0.4, 0.7), 2)
-            avg_session_duration = int(random.uniform(120, 300))
-            
-            rows.append({
-                'dimensionValues': [{'value': date_str}],
-                'metricValues': [
-                    {'value': str(sessions)},
-                    {'value': str(active_users)},
-                    {'value': str(new_users)},
-                    {'value': str(engagement_rate)},
-                    {'value': str(avg_session_duration)}
-                ]
-            })
-        
-        # レスポンス形式に整形
-        mock_data = {
-            'dimensionHeaders': [{'name': 'date'}],
-            'metricHeaders': [
-                {'name': 'sessions', 'type': 'INTEGER'},
-                {'name': 'activeUsers', 'type': 'INTEGER'},
-                {'name': 'newUsers', 'type': 'INTEGER'},
-                {'name': 'engagementRate', 'type': 'FLOAT'},
-                {'name': 'averageSessionDuration', 'type': 'INTEGER'}
-            ],
-            'rows': rows
-        }
-        
-        return mock_data
+        # 同じ日・同じ日数のモックデータは一度だけ生成する
+        return _build_mock_traffic_data(datetime.now().date(), days)
     
-    def analyze_traffic(self, days=30):
+    def analyze_traffic(self, days=30, stream=False):
         """
         トラフィックデータを分析します。
         
         Args:
             days (int): 分析する日数
+            stream (bool): Trueの場合、日次データをリストではなく1件ずつ返すジェネレータにする
             
         Returns:
             dict: 分析結果
@@ -414,50 +769,35 @@ class GoogleAnalyticsAPI:
             'daily_data': []
         }
         
-        # データを処理
-        if 'rows' in traffic_data:
-            total_sessions = 0
-            total_users = 0
-            total_new_users = 0
-            total_engagement_rate = 0
-            total_session_duration = 0
+        # データを処理（指標は行×指標の配列にまとめて集計する）
+        rows = traffic_data.get('rows')
+        if rows:
+            metrics = np.array(
+                [[value['value'] for value in row['metricValues'][:5]] for row in rows],
+                dtype=np.float64
+            )
+            counts = metrics[:, [0, 1, 2, 4]].astype(np.int64)
+            total_sessions, total_users, total_new_users, _ = counts.sum(axis=0).tolist()
+            avg_engagement_rate = float(metrics[:, 3].mean())
+            avg_session_duration = float(metrics[:, 4].mean())
             
-            for row in traffic_data['rows']:
-                date_value = row['dimensionValues'][0]['value']
-                sessions = int(row['metricValues'][0]['value'])
-                active_users = int(row['metricValues'][1]['value'])
-                new_users = int(row['metricValues'][2]['value'])
-                engagement_rate = float(row['metricValues'][3]['value'])
-                session_duration = int(row['metricValues'][4]['value'])
-                
-                # 合計を計算
-                total_sessions += sessions
-                total_users += active_users
-                total_new_users += new_users
-                total_engagement_rate += engagement_rate
-                total_session_duration += session_duration
-                
-                # 日付フォーマットを変換
-                formatted_date = f"{date_value[:4]}-{date_value[4:6]}-{date_value[6:]}"
-                
-                # 日次データを追加
-                results['daily_data'].append({
-                    'date': formatted_date,
+            # 日次データを作成（日付はYYYYMMDDからYYYY-MM-DDに変換）
+            daily_data = (
+                {
+                    'date': f"{date_value[:4]}-{date_value[4:6]}-{date_value[6:]}",
                     'sessions': sessions,
                     'active_users': active_users,
                     'new_users': new_users,
                     'engagement_rate': round(engagement_rate * 100, 1),
                     'avg_session_duration': session_duration
-                })
-            
-            # 平均値を計算
-            row_count = len(traffic_data['rows'])
-            if row_count > 0:
-                avg_engagement_rate = total_engagement_rate / row_count
-                avg_session_duration = total_session_duration / row_count
-            else:
-                avg_engagement_rate = 0
-                avg_session_duration = 0
+                }
+                for date_value, (sessions, active_users, new_users, session_duration), engagement_rate in zip(
+                    (row['dimensionValues'][0]['value'] for row in rows),
+                    counts.tolist(),
+                    metrics[:, 3].tolist()
+                )
+            )
+            results['daily_data'] = daily_data if stream else list(daily_data)
             
             # サマリーを更新
             results['summary'] = {
@@ -482,7 +822,8 @@ class GoogleAnalyticsAPI:
             str: レポートファイルのパス
         """
         # 分析を実行
-        analysis_results = self.analyze_traffic(days)
+        # 日次データはファイルへ書き出しながら1件ずつ生成する
+        analysis_results = self.analyze_traffic(days, stream=True)
         
         # 出力ディレクトリの設定
         if output_dir is None:
@@ -492,13 +833,32 @@ class GoogleAnalyticsAPI:
         os.makedirs(output_dir, exist_ok=True)
         
         # ファイル名を生成
-        property_id = self.property_id.replace('/', '_')
+        property_id = self.property_id.translate(_SLASH_TO_UNDERSCORE)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"analytics_report_{property_id}_{timestamp}.json"
         filepath = os.path.join(output_dir, filename)
         
         # レポートをJSONファイルとして保存
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, ensure_ascii=False, indent=2)
+        _write_json_report(filepath, analysis_results)
         
         return filepath
+
+
+def generate_all_reports(search_console_api, analytics_api, days=30, output_dir=None):
+    """
+    Search ConsoleとAnalyticsのレポートを並行して生成します。
+    
+    Args:
+        search_console_api (GoogleSearchConsoleAPI): Search Console APIクライアント
+        analytics_api (GoogleAnalyticsAPI): Analytics APIクライアント
+        days (int): 分析する日数
+        output_dir (str): 出力ディレクトリ
+        
+    Returns:
+        tuple: (Search Consoleレポートのパス, Analyticsレポートのパス)
+    """
+    # それぞれ別のAPIへのリクエストで待ち時間が主なため、スレッドで同時に実行する
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        search_console_future = executor.submit(search_console_api.generate_report, days, output_dir)
+        analytics_future = executor.submit(analytics_api.generate_report, days, output_dir)
+        return search_console_future.result(), analytics_future.result()
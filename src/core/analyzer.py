@@ -7,6 +7,9 @@ import tldextract
 import time
 from datetime import datetime
 
+# 見出しタグ名
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+
 class SEOAnalyzer:
     """
     SEO分析の中核となるクラス。
@@ -109,14 +112,12 @@ class SEOAnalyzer:
             print("Warning: Soup object is not available for heading extraction.")
             return headings
         try:
-            for i in range(1, 7):
-                tag_name = f'h{i}'
-                found_tags = self.soup.find_all(tag_name)
-                for tag in found_tags:
-                    # タグが存在し、テキストコンテンツがある場合のみ追加
-                    text = tag.get_text(strip=True)
-                    if text:
-                         headings[tag_name].append(text)
+            # h1〜h6を一度の走査でまとめて取得
+            for tag in self.soup.find_all(_HEADING_TAGS):
+                # タグが存在し、テキストコンテンツがある場合のみ追加
+                text = tag.get_text(strip=True)
+                if text:
+                     headings[tag.name].append(text)
         except Exception as e:
             print(f"Error extracting headings: {e}")
         return headings
@@ -1,4 +1,5 @@
 import unittest
+import asyncio
 import sys
 import os
 import json
@@ -137,7 +138,8 @@ class TestIntegration(unittest.TestCase):
         self.assertTrue(len(result['external_links']) >= 1)  # 少なくとも1つの外部リンクがある
 
     @patch('requests.get')
-    def test_technical_analyzer(self, mock_get):
+    @patch('requests.Session.get')
+    def test_technical_analyzer(self, mock_session_get, mock_get):
         """TechnicalAnalyzerのテスト"""
         # requestsのモック設定
         mock_response = MagicMock()
@@ -149,7 +151,9 @@ class TestIntegration(unittest.TestCase):
             'Server': 'nginx',
             'X-Powered-By': 'PHP/7.4.3'
         }
+        mock_response.iter_content.return_value = [mock_response.text.encode()]
         mock_get.return_value = mock_response
+        mock_session_get.return_value = mock_response
 
         # TechnicalAnalyzerのテスト
         analyzer = TechnicalAnalyzer(self.test_url)
@@ -220,8 +224,9 @@ class TestIntegration(unittest.TestCase):
         # スコアの範囲を検証
         self.assertTrue(0 <= result['ad_score'] <= 100)
 
+    @patch('src.analyzers.mobile_analyzer._get_session')
     @patch('requests.get')
-    def test_mobile_analyzer(self, mock_get):
+    def test_mobile_analyzer(self, mock_get, mock_get_session):
         """MobileAnalyzerのテスト"""
         # requestsのモック設定
         mock_response = MagicMock()
@@ -229,6 +234,7 @@ class TestIntegration(unittest.TestCase):
             mock_response.text = f.read()
         mock_response.status_code = 200
         mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
 
         # MobileAnalyzerのテスト
         analyzer = MobileAnalyzer(self.test_url)
@@ -253,15 +259,159 @@ class TestIntegration(unittest.TestCase):
         self.assertIn('has_viewport', result['viewport'])
         self.assertTrue(result['viewport']['has_viewport'])  # モックHTMLにはビューポートメタタグがある
 
+    @patch('src.analyzers.mobile_analyzer._get_session')
     @patch('requests.get')
-    def test_pagespeed_analyzer(self, mock_get):
+    def test_mobile_analyzer_analyze_many(self, mock_get, mock_get_session):
+        """MobileAnalyzer.analyze_manyのテスト"""
+        # requestsのモック設定
+        mock_response = MagicMock()
+        with open(os.path.join(os.path.dirname(__file__), 'test_data', 'mock_html.html'), 'r') as f:
+            mock_response.text = f.read()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
+
+        urls = [self.test_url, "https://example.com/about", "https://example.org"]
+        results = MobileAnalyzer.analyze_many(urls, max_concurrency=2)
+
+        # 結果の検証（入力と同じ順序で返る）
+        self.assertEqual(len(results), len(urls))
+        for url, result in zip(urls, results):
+            self.assertEqual(result['url'], url)
+            self.assertIn('mobile_friendly_score', result)
+            self.assertTrue(result['viewport']['has_viewport'])
+
+    @patch('src.analyzers.technical_analyzer.aiohttp', None)
+    @patch('requests.Session.get')
+    def test_technical_analyzer_analyze_many(self, mock_session_get):
+        """TechnicalAnalyzer.analyze_manyのテスト"""
+        # requestsのモック設定
+        mock_response = MagicMock()
+        with open(os.path.join(os.path.dirname(__file__), 'test_data', 'mock_html.html'), 'r') as f:
+            mock_response.text = f.read()
+        mock_response.iter_content.return_value = [mock_response.text.encode()]
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html; charset=UTF-8'}
+        mock_session_get.return_value = mock_response
+
+        urls = [self.test_url, "https://example.com/about", "https://example.org"]
+        results = asyncio.run(TechnicalAnalyzer.analyze_many(urls, max_concurrency=2))
+
+        # 結果の検証（URLごとに1件ずつ返る）
+        self.assertEqual(len(results), len(urls))
+        for result in results:
+            self.assertEqual(result['status_code'], 200)
+            self.assertEqual(result['meta_tags']['title'], 'Test Page for SEO Analysis')
+            self.assertTrue(result['mobile_friendly']['viewport_present'])
+
+    @patch('src.analyzers.technical_analyzer.aiohttp', None)
+    @patch('requests.Session.head')
+    @patch('requests.Session.get')
+    def test_technical_analyzer_head_then_not_modified(self, mock_session_get, mock_session_head):
+        """ヘッダーのみの分析結果が、後の通常の分析の304で再利用されないことのテスト"""
+        url = "https://example.com/head-then-304"
+        
+        # HEADリクエストのモック設定（ETag付きの200）
+        head_response = MagicMock()
+        head_response.status_code = 200
+        head_response.headers = {'Content-Type': 'text/html; charset=UTF-8', 'ETag': '"v1"'}
+        mock_session_head.return_value = head_response
+        
+        TechnicalAnalyzer(url, only_headers=True).analyze()
+        
+        # GETリクエストのモック設定（If-None-Matchが送られた場合は304を返す）
+        with open(os.path.join(os.path.dirname(__file__), 'test_data', 'mock_html.html'), 'r') as f:
+            html = f.read()
+        
+        def get(request_url, headers=None, **kwargs):
+            response = MagicMock()
+            response.headers = {'Content-Type': 'text/html; charset=UTF-8', 'ETag': '"v1"'}
+            if headers and 'If-None-Match' in headers:
+                response.status_code = 304
+                response.iter_content.return_value = []
+            else:
+                response.status_code = 200
+                response.iter_content.return_value = [html.encode()]
+            return response
+        
+        mock_session_get.side_effect = get
+        
+        result = TechnicalAnalyzer(url).analyze()
+        
+        # 結果の検証（本文を解析した結果が返る）
+        self.assertEqual(result['status_code'], 200)
+        self.assertEqual(result['meta_tags']['title'], 'Test Page for SEO Analysis')
+        self.assertTrue(result['mobile_friendly']['viewport_present'])
+
+    @patch('requests.get')
+    @patch('requests.Session.head')
+    @patch('requests.Session.get')
+    def test_pagespeed_probe_keeps_cache_headers_on_size_error(self, mock_session_get, mock_session_head, mock_get):
+        """サイズ取得のGETが失敗しても、HEADで得たキャッシュヘッダー情報が保持されることのテスト"""
+        from requests.structures import CaseInsensitiveDict
+        
+        # ページ取得（requests.get）のモック設定
+        mock_response = MagicMock()
+        with open(os.path.join(os.path.dirname(__file__), 'test_data', 'mock_html.html'), 'r') as f:
+            mock_response.text = f.read()
+        mock_response.content = mock_response.text.encode()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        resource_url = "https://example.com/static/app.js"
+        head_headers = CaseInsensitiveDict({'Cache-Control': 'max-age=31536000', 'ETag': '"abc"'})
+        
+        # HEADはキャッシュヘッダーのみ（Content-Lengthなし）、サイズ取得のGETは失敗
+        head_response = MagicMock()
+        head_response.ok = True
+        head_response.headers = head_headers
+        mock_session_head.return_value = head_response
+        mock_session_get.return_value = mock_response
+        
+        analyzer = PageSpeedAnalyzer(self.test_url)
+        mock_session_get.side_effect = ConnectionResetError('reset')
+        result = analyzer._probe_resource(resource_url)
+        
+        # 結果の検証（同期）
+        self.assertEqual(result['size'], 0)
+        self.assertTrue(result['cache']['has_cache_headers'])
+        self.assertNotIn('error', result['cache'])
+        
+        # aiohttpでの取得（_fetch_meta）も同様に検証
+        class FakeResponse:
+            ok = True
+            headers = head_headers
+            
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *args):
+                return False
+        
+        class FakeSession:
+            def head(self, url, **kwargs):
+                return FakeResponse()
+            
+            def get(self, url, **kwargs):
+                raise ConnectionResetError('reset')
+        
+        size, cache_info = asyncio.run(analyzer._fetch_meta(FakeSession(), asyncio.Semaphore(1), resource_url))
+        self.assertEqual(size, 0)
+        self.assertTrue(cache_info['has_cache_headers'])
+        self.assertNotIn('error', cache_info)
+
+    @patch('requests.get')
+    @patch('requests.Session.get')
+    def test_pagespeed_analyzer(self, mock_session_get, mock_get):
         """PageSpeedAnalyzerのテスト"""
         # requestsのモック設定
         mock_response = MagicMock()
         with open(os.path.join(os.path.dirname(__file__), 'test_data', 'mock_html.html'), 'r') as f:
             mock_response.text = f.read()
+        mock_response.iter_content.return_value = [mock_response.text.encode()]
         mock_response.status_code = 200
         mock_get.return_value = mock_response
+        mock_session_get.return_value = mock_response
 
         # PageSpeedAnalyzerのテスト
         analyzer = PageSpeedAnalyzer(self.test_url)
@@ -343,6 +493,38 @@ class TestIntegration(unittest.TestCase):
         self.assertIn('top_sources', result['traffic'])
         self.assertIn('devices', result['traffic'])
 
+    @patch('requests.get')
+    def test_analytics_analyzer_to_json(self, mock_get):
+        """AnalyticsAnalyzer.to_jsonのテスト"""
+        analyzer = AnalyticsAnalyzer(self.test_url)
+        result = json.loads(analyzer.to_json())
+        expected = json.loads(json.dumps(analyzer.analyze()))
+
+        # analyze()と同じ内容がJSONとして読み込めること（実行ごとに変わる時刻・所要時間は除く）
+        for key in ('timestamp', 'analysis_duration'):
+            result.pop(key)
+            expected.pop(key)
+        self.assertEqual(result, expected)
+
+    @patch('requests.get')
+    def test_analytics_analyzer_results_are_independent(self, mock_get):
+        """AnalyticsAnalyzer.analyzeの結果を変更しても次回の結果に影響しないことのテスト"""
+        analyzer = AnalyticsAnalyzer(self.test_url)
+        result = analyzer.analyze()
+        expected = json.loads(json.dumps(result))
+
+        # 1回目の結果を変更
+        result['recommendations'].append('追加した提案')
+        result['traffic']['summary']['sessions'] = -1
+        result['traffic']['date_data'].clear()
+
+        # 2回目は別のオブジェクトで、変更の影響を受けない
+        second = analyzer.analyze()
+        self.assertIsNot(second, result)
+        self.assertEqual(second['recommendations'], expected['recommendations'])
+        self.assertEqual(second['traffic']['summary'], expected['traffic']['summary'])
+        self.assertEqual(second['traffic']['date_data'], expected['traffic']['date_data'])
+
     @patch('requests.get')
     def test_seo_analyzer_integration(self, mock_get):
         """SEOAnalyzer統合テスト"""